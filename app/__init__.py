@@ -1,97 +1,195 @@
 import os
+import copy
+import atexit
+import queue
 import logging
-import uuid
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+import orjson
 from flask import Flask, request, g
-from pythonjsonlogger import jsonlogger
 from app.config import config
 from app.extensions import db, jwt, migrate
-from flask_cors import CORS
+from app.middleware.error_handler import register_error_handlers
+from app.services.extraction_pool import init_extraction_pool
+from app.utils.helpers import ensure_dir
+from app.utils.responses import OrjsonProvider, error_response
+from app.utils.uploads import UploadRequest, init_upload_folder
 import time
 
 
+# Attributes every LogRecord carries - anything else came in via `extra`
+_RESERVED_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class OrjsonFormatter(logging.Formatter):
+    """JSON log formatter backed by orjson"""
+    
+    def format(self, record):
+        log_record = {
+            'timestamp': record.created,
+            'level': record.levelname,
+            'message': record.getMessage(),
+            'service': 'contract-management-api'
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS:
+                log_record[key] = value
+        if record.exc_info:
+            log_record['exc_info'] = self.formatException(record.exc_info)
+        return orjson.dumps(log_record, default=str, option=orjson.OPT_NAIVE_UTC).decode()
+
+
+# Built once and shared by every handler/app instance
+JSON_FORMATTER = OrjsonFormatter()
+CONSOLE_FORMATTER = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+
+# Neither format emits caller, thread or process info - skip collecting it per record
+logging._srcfile = None
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Queue handler that never blocks the request thread"""
+    
+    def prepare(self, record):
+        # The base prepare() pre-formats the record and drops exc_info -
+        # keep the exception for OrjsonFormatter's own exc_info field
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        # Capture request_id here - the listener thread has no request context
+        try:
+            if hasattr(g, 'request_id'):
+                record.request_id = g.request_id
+        except RuntimeError:
+            pass
+        return record
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Drop the record rather than stall the request
+            pass
+
+
+# One file listener per process - a later create_app() replaces it
+_log_listener = None
+
+
+def _stop_log_listener():
+    """Flush and stop the file log listener, closing its handlers"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+        _log_listener = None
+
+
+atexit.register(_stop_log_listener)
+
+
 def setup_logging(app):
     """Setup production-grade JSON logging"""
+    global _log_listener
     
-    log_dir = os.path.dirname(app.config['LOG_FILE'])
-    os.makedirs(log_dir, exist_ok=True)
-    
-    # JSON formatter
-    class CustomJsonFormatter(jsonlogger.JsonFormatter):
-        def add_fields(self, log_record, record, message_dict):
-            super().add_fields(log_record, record, message_dict)
-            log_record['timestamp'] = record.created
-            log_record['level'] = record.levelname
-            log_record['service'] = 'contract-management-api'
-            # Only add request_id if we're in a request context
-            try:
-                if hasattr(g, 'request_id'):
-                    log_record['request_id'] = g.request_id
-            except RuntimeError:
-                # Not in request context, skip request_id
-                pass
-    
-    formatter = CustomJsonFormatter('%(timestamp)s %(level)s %(message)s')
+    _stop_log_listener()
+    ensure_dir(os.path.dirname(app.config['LOG_FILE']))
     
     # Console
     console = logging.StreamHandler()
     console.setLevel(logging.INFO)
-    console.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    console.setFormatter(CONSOLE_FORMATTER)
     
-    # File
+    # File - a single JSON log, errors are found by level rather than a second file
     file_handler = RotatingFileHandler(
         app.config['LOG_FILE'],
         maxBytes=10*1024*1024,
         backupCount=5
     )
     file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(formatter)
+    file_handler.setFormatter(JSON_FORMATTER)
     
-    # Errors
-    error_handler = RotatingFileHandler(
-        app.config['LOG_FILE'].replace('.log', '_errors.log'),
-        maxBytes=10*1024*1024,
-        backupCount=5
-    )
-    error_handler.setLevel(logging.ERROR)
-    error_handler.setFormatter(formatter)
+    # File writes happen on a background listener thread
+    log_queue = queue.Queue(maxsize=10000)
+    _log_listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _log_listener.start()
+    app.extensions['log_listener'] = _log_listener
     
-    app.logger.handlers = []
-    app.logger.addHandler(console)
-    app.logger.addHandler(file_handler)
-    app.logger.addHandler(error_handler)
+    app.logger.handlers = [console, DroppingQueueHandler(log_queue)]
     app.logger.setLevel(logging.INFO)
 
 
 def register_request_logging(app):
     """Log all requests with request ID"""
     
+    logger = app.logger
+    skip_methods = {'HEAD', 'OPTIONS'}
+    skip_paths = app.config['LOG_SKIP_PATHS']
+    
     @app.before_request
     def before_request():
-        g.start_time = time.time()
-        # Generate request ID ourselves
-        g.request_id = request.headers.get('X-Request-ID', str(uuid.uuid4()))
-        app.logger.info('Request started', extra={
-            'method': request.method,
-            'endpoint': request.path
-        })
+        g.start_ns = time.monotonic_ns()
+        # Read the raw WSGI environ - cheaper than the request proxy's parsed headers
+        g.request_id = request.environ.get('HTTP_X_REQUEST_ID') or os.urandom(16).hex()
     
     @app.after_request
     def after_request(response):
         # Add request ID to response headers
         response.headers['X-Request-ID'] = g.request_id
         
-        if hasattr(g, 'start_time'):
-            duration = (time.time() - g.start_time) * 1000
-            app.logger.info('Request completed', extra={
-                'duration_ms': round(duration, 2),
+        environ = request.environ
+        method = environ['REQUEST_METHOD']
+        path = environ['PATH_INFO']
+        
+        # Preflights and health probes only add noise to the logs
+        if method in skip_methods or path in skip_paths:
+            return response
+        
+        # Don't build the extra dict if INFO records would be discarded
+        if 'start_ns' in g and logger.isEnabledFor(logging.INFO):
+            logger.info('Request completed', extra={
+                'duration_ms': (time.monotonic_ns() - g.start_ns) // 1_000_000,
                 'status_code': response.status_code,
-                'method': request.method,
-                'endpoint': request.path
+                'method': method,
+                'endpoint': path
             })
         return response
 
 
+# Fixed allow-all policy, so the headers never change between requests
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Authorization, Content-Type, X-Request-ID',
+    'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS'
+}
+
+
+def register_cors(app):
+    """Add static CORS headers to every response"""
+    
+    @app.after_request
+    def add_cors_headers(response):
+        response.headers.update(CORS_HEADERS)
+        return response
+
+
+def register_upload_limit(app):
+    """Reject bodies whose declared size is over MAX_CONTENT_LENGTH up front"""
+    
+    max_length = app.config['MAX_CONTENT_LENGTH']
+    message = f"Request too large. Maximum size is {app.config['MAX_FILE_SIZE_MB']} MB"
+    
+    @app.before_request
+    def check_content_length():
+        # Werkzeug would also refuse it, but only once the view touches the
+        # form - after routing, JWT verification and user lookup
+        if max_length and (request.content_length or 0) > max_length:
+            return error_response(message, 413)
+
+
 def create_app(config_name=None):
     """Application factory pattern"""
     if config_name is None:
@@ -99,6 +197,8 @@ def create_app(config_name=None):
     
     app = Flask(__name__)
     app.config.from_object(config[config_name])
+    app.json = OrjsonProvider(app)
+    app.request_class = UploadRequest
     
     # Setup logging
     setup_logging(app)
@@ -109,11 +209,17 @@ def create_app(config_name=None):
     migrate.init_app(app, db)
     
     # CORS
-    CORS(app, resources={r"/api/*": {"origins": "*"}})
+    register_cors(app)
     
     # Register request logging
     register_request_logging(app)
     
+    # Oversize uploads are refused before any of the request is read
+    register_upload_limit(app)
+    
+    # Register error handlers
+    register_error_handlers(app)
+    
     # Register blueprints
     from app.api import api_v1
     app.register_blueprint(api_v1, url_prefix='/api')
@@ -123,7 +229,9 @@ def create_app(config_name=None):
         from app import models
     
     # Create directories
-    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+    init_upload_folder(app)
+    
+    init_extraction_pool(app)
     
     app.logger.info('Application started', extra={'environment': config_name})
     return app
@@ -1,8 +1,11 @@
 """Authentication API endpoints"""
 
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint
+from flask_jwt_extended import jwt_required
 from app.services.auth_service import AuthService
+from app.utils.auth import get_current_user_id
+from app.utils.helpers import get_json_body
+from app.utils.responses import success_response, error_response
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -31,35 +34,27 @@ def login():
         }
     """
     try:
-        data = request.get_json()
+        data = get_json_body()
         
         if not data:
-            return jsonify({
-                'success': False,
-                'error': 'No data provided'
-            }), 400
+            return error_response('No data provided', 400)
         
         email = data.get('email')
         password = data.get('password')
         
+        if not isinstance(email, str) or not email.strip() or not isinstance(password, str) or not password:
+            return error_response('Email and password are required', 400)
+        
+        if auth_service.login_blocked(email):
+            return error_response('Too many failed login attempts, try again later', 429)
+        
         # Call service
         result = auth_service.login(email, password)
         
-        return jsonify({
-            'success': True,
-            'data': result
-        }), 200
+        return success_response(result)
         
     except ValueError as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 401
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        return error_response(str(e), 401)
 
 
 @auth_bp.route('/me', methods=['GET'])
@@ -80,25 +75,12 @@ def get_current_user():
             }
         }
     """
-    try:
-        current_user_id = int(get_jwt_identity())
-        
-        # Call service
-        user_data = auth_service.get_current_user(current_user_id)
-        
-        if not user_data:
-            return jsonify({
-                'success': False,
-                'error': 'User not found'
-            }), 404
-        
-        return jsonify({
-            'success': True,
-            'data': user_data
-        }), 200
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    current_user_id = get_current_user_id()
+    
+    # Call service
+    user_data = auth_service.get_current_user(current_user_id)
+    
+    if not user_data:
+        return error_response('User not found', 404)
+    
+    return success_response(user_data)
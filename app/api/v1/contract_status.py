@@ -1,13 +1,36 @@
 """Contract Status API endpoints"""
 
-from flask import Blueprint, jsonify
+import time
+from flask import Blueprint
 from app.repositories.contract_status_repository import ContractStatusRepository
+from app.utils.responses import dumps, json_response
 
 contract_status_bp = Blueprint('contract_status', __name__)
 
 # Initialize repository
 contract_status_repo = ContractStatusRepository()
 
+# Lookup table rarely changes - serve the serialized payload from memory
+CACHE_TTL_SECONDS = 300
+_cache = {'body': None, 'expires_at': 0.0}
+
+
+def _get_payload() -> bytes:
+    """Return the cached JSON body, rebuilding it once the TTL has passed"""
+    now = time.monotonic()
+    if _cache['body'] is None or now >= _cache['expires_at']:
+        statuses_data = [
+            {'id': status.id, 'name': status.name, 'description': status.description}
+            for status in contract_status_repo.get_all_statuses()
+        ]
+        
+        _cache['body'] = dumps({
+            'success': True,
+            'data': statuses_data
+        })
+        _cache['expires_at'] = now + CACHE_TTL_SECONDS
+    return _cache['body']
+
 
 @contract_status_bp.route('', methods=['GET'])
 def get_contract_statuses():
@@ -26,24 +49,4 @@ def get_contract_statuses():
             ]
         }
     """
-    try:
-        statuses = contract_status_repo.get_all_statuses()
-        
-        statuses_data = []
-        for status in statuses:
-            statuses_data.append({
-                'id': status.id,
-                'name': status.name,
-                'description': status.description
-            })
-        
-        return jsonify({
-            'success': True,
-            'data': statuses_data
-        }), 200
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    return json_response(_get_payload())
@@ -1,13 +1,36 @@
 """Contract Types API endpoints"""
 
-from flask import Blueprint, jsonify
+import time
+from flask import Blueprint
 from app.repositories.contract_type_repository import ContractTypeRepository
+from app.utils.responses import dumps, json_response
 
 contract_types_bp = Blueprint('contract_types', __name__)
 
 # Initialize repository
 contract_type_repo = ContractTypeRepository()
 
+# Lookup table rarely changes - serve the serialized payload from memory
+CACHE_TTL_SECONDS = 300
+_cache = {'body': None, 'expires_at': 0.0}
+
+
+def _get_payload() -> bytes:
+    """Return the cached JSON body, rebuilding it once the TTL has passed"""
+    now = time.monotonic()
+    if _cache['body'] is None or now >= _cache['expires_at']:
+        types_data = [
+            {'id': contract_type.id, 'name': contract_type.name, 'description': contract_type.description}
+            for contract_type in contract_type_repo.get_all_types()
+        ]
+        
+        _cache['body'] = dumps({
+            'success': True,
+            'data': types_data
+        })
+        _cache['expires_at'] = now + CACHE_TTL_SECONDS
+    return _cache['body']
+
 
 @contract_types_bp.route('', methods=['GET'])
 def get_contract_types():
@@ -26,24 +49,4 @@ def get_contract_types():
             ]
         }
     """
-    try:
-        types = contract_type_repo.get_all_types()
-        
-        types_data = []
-        for contract_type in types:
-            types_data.append({
-                'id': contract_type.id,
-                'name': contract_type.name,
-                'description': contract_type.description
-            })
-        
-        return jsonify({
-            'success': True,
-            'data': types_data
-        }), 200
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    return json_response(_get_payload())
@@ -1,19 +1,67 @@
 """Contract management API endpoints"""
 
-import os
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from werkzeug.utils import secure_filename
+import threading
+import time
+from flask import Blueprint, request, current_app
+from flask_jwt_extended import jwt_required
 from app.services.contract_service import ContractService
-from app.services.contract_extraction_service import ContractExtractionService
+from app.services.extraction_pool import extract_document
 from app.models.activity_history import ActivityHistory
 from app.utils.activity_logger import log_activity
+from app.utils.auth import get_current_user_id
+from app.utils.helpers import get_json_body
+from app.utils.responses import dumps, json_response, success_response, success_stream_response, error_response
 
 contracts_bp = Blueprint('contracts', __name__)
 
 # Initialize services
 contract_service = ContractService()
-extraction_service = ContractExtractionService()  # NER service
+
+# File types the NER extractor can read
+EXTRACTION_EXTENSIONS = frozenset({'pdf', 'docx', 'doc'})
+
+# Largest page the contract list serves when paginating
+MAX_PAGE_SIZE = 200
+
+# Serialized unpaginated contract list: (list version, expiry, body)
+_contract_list_cache = None
+_contract_list_version = 0  # bumped after every write that changes the list
+_contract_list_version_lock = threading.Lock()  # gthread workers write concurrently
+
+
+def invalidate_contract_list():
+    """Drop this worker's cached contract list after a contract is written"""
+    global _contract_list_version
+    with _contract_list_version_lock:
+        _contract_list_version += 1
+
+
+def _contract_list_response():
+    """
+    Full contract list response, served from the cache while it's fresh
+    
+    The cache is per worker and off by default: a write here invalidates
+    it immediately, writes in other workers show up once
+    CONTRACT_LIST_CACHE_TTL expires. With the cache disabled the list is
+    streamed instead.
+    """
+    global _contract_list_cache
+    ttl = current_app.config['CONTRACT_LIST_CACHE_TTL']
+    if not ttl:
+        return success_stream_response(contract_service.iter_all_contracts())
+    
+    # Read the version before querying - a write committed during the query
+    # bumps it, so the body built here is never stored as current
+    version = _contract_list_version
+    now = time.monotonic()
+    cached = _contract_list_cache
+    if cached and cached[0] == version and cached[1] > now:
+        return json_response(cached[2])
+    
+    contracts_data, _ = contract_service.get_all_contracts()
+    body = dumps({'success': True, 'data': contracts_data})
+    _contract_list_cache = (version, now + ttl, body)
+    return json_response(body)
 
 
 @contracts_bp.route('', methods=['GET'])
@@ -22,6 +70,10 @@ def get_all_contracts():
     """
     Get all contracts
     
+    Query params (optional, for keyset pagination):
+        limit: Page size (1-MAX_PAGE_SIZE)
+        after: nextCursor from the previous page
+    
     Response:
         {
             "success": true,
@@ -33,20 +85,19 @@ def get_all_contracts():
                     "clientName": "...",
                     ...
                 }
-            ]
+            ],
+            "nextCursor": "CTR_uuid_V1"  (only when limit is given; null on the last page)
         }
     """
-    try:
-        contracts_data = contract_service.get_all_contracts()
-        return jsonify({
-            'success': True,
-            'data': contracts_data
-        }), 200
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    limit = request.args.get('limit')
+    if limit is None:
+        return _contract_list_response()
+    
+    if not limit.isdigit() or not 0 < int(limit) <= MAX_PAGE_SIZE:
+        return error_response(f'limit must be between 1 and {MAX_PAGE_SIZE}', 400)
+    
+    contracts_data, next_cursor = contract_service.get_all_contracts(int(limit), request.args.get('after'))
+    return success_response(contracts_data, nextCursor=next_cursor)
 
 
 @contracts_bp.route('', methods=['POST'])
@@ -78,41 +129,26 @@ def create_contract():
             }
         }
     """
-    try:
-        current_user_id = int(get_jwt_identity())
-        
-        # Parse form data
-        data = {
-            'contractName': request.form.get('contractName', '').strip(),
-            'clientName': request.form.get('clientName', '').strip(),
-            'contractType': request.form.get('contractType', '').strip(),
-            'startDate': request.form.get('startDate', '').strip(),
-            'endDate': request.form.get('endDate', '').strip(),
-            'value': request.form.get('value', '').strip(),
-            'description': request.form.get('description', '')
-        }
-        
-        file = request.files.get('file')
-        
-        # Call service
-        result = contract_service.create_contract(data, file, current_user_id)
-        
-        return jsonify({
-            'success': True,
-            'message': 'Contract created successfully',
-            'data': result
-        }), 201
-        
-    except ValueError as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 400
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    current_user_id = get_current_user_id()
+    
+    # Parse form data
+    data = {
+        'contractName': request.form.get('contractName', '').strip(),
+        'clientName': request.form.get('clientName', '').strip(),
+        'contractType': request.form.get('contractType', '').strip(),
+        'startDate': request.form.get('startDate', '').strip(),
+        'endDate': request.form.get('endDate', '').strip(),
+        'value': request.form.get('value', '').strip(),
+        'description': request.form.get('description', '')
+    }
+    
+    file = request.files.get('file')
+    
+    # Call service
+    result = contract_service.create_contract(data, file, current_user_id)
+    invalidate_contract_list()
+    
+    return success_response(result, message='Contract created successfully', status=201)
 
 
 @contracts_bp.route('/<string:instance_id>', methods=['GET'])
@@ -130,25 +166,12 @@ def get_contract_details(instance_id):
             }
         }
     """
-    try:
-        result = contract_service.get_contract_details(instance_id)
-        
-        if not result:
-            return jsonify({
-                'success': False,
-                'error': 'Contract not found'
-            }), 404
-        
-        return jsonify({
-            'success': True,
-            'data': result
-        }), 200
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    result = contract_service.get_contract_details(instance_id)
+    
+    if not result:
+        return error_response('Contract not found', 404)
+    
+    return success_response(result)
 
 
 @contracts_bp.route('/<string:instance_id>', methods=['PUT'])
@@ -179,36 +202,21 @@ def update_contract(instance_id):
             }
         }
     """
-    try:
-        data = request.get_json()
-        
-        contract = contract_service.update_contract(instance_id, data)
-        
-        if not contract:
-            return jsonify({
-                'success': False,
-                'error': 'Contract not found'
-            }), 404
-        
-        return jsonify({
-            'success': True,
-            'message': 'Contract updated successfully',
-            'data': {
-                'id': contract.contract_instance_id,
-                'lastModified': contract.updated_at.isoformat()
-            }
-        }), 200
-        
-    except ValueError as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 400
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    data = get_json_body()
+    
+    if not data:
+        return error_response('No data provided', 400)
+    
+    contract = contract_service.update_contract(instance_id, data)
+    
+    if not contract:
+        return error_response('Contract not found', 404)
+    invalidate_contract_list()
+    
+    return success_response({
+        'id': contract.contract_instance_id,
+        'lastModified': contract.updated_at
+    }, message='Contract updated successfully')
 
 
 @contracts_bp.route('/<string:instance_id>/documents', methods=['POST'])
@@ -234,34 +242,15 @@ def upload_document_to_contract(instance_id):
             }
         }
     """
-    try:
-        current_user_id = int(get_jwt_identity())
-        file = request.files.get('file')
-        
-        if not file:
-            return jsonify({
-                'success': False,
-                'error': 'No file provided'
-            }), 400
-        
-        result = contract_service.upload_document(instance_id, file, current_user_id)
-        
-        return jsonify({
-            'success': True,
-            'message': 'Document uploaded successfully',
-            'data': result
-        }), 201
-        
-    except ValueError as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 400
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    current_user_id = get_current_user_id()
+    file = request.files.get('file')
+    
+    if not file:
+        return error_response('No file provided', 400)
+    
+    result = contract_service.upload_document(instance_id, file, current_user_id)
+    
+    return success_response(result, message='Document uploaded successfully', status=201)
 
 
 @contracts_bp.route('/<string:instance_id>/renew', methods=['POST'])
@@ -287,37 +276,22 @@ def renew_contract(instance_id):
             }
         }
     """
-    try:
-        current_user_id = int(get_jwt_identity())
-        
-        # Parse form data
-        data = {
-            'new_start_date': request.form.get('new_start_date', '').strip(),
-            'new_end_date': request.form.get('new_end_date', '').strip(),
-            'new_value': request.form.get('new_value', '').strip()
-        }
-        
-        file = request.files.get('file')
-        
-        # Call service
-        result = contract_service.renew_contract(instance_id, data, file, current_user_id)
-        
-        return jsonify({
-            'success': True,
-            'message': 'Contract renewed successfully',
-            'data': result
-        }), 201
-        
-    except ValueError as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 400
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    current_user_id = get_current_user_id()
+    
+    # Parse form data
+    data = {
+        'new_start_date': request.form.get('new_start_date', '').strip(),
+        'new_end_date': request.form.get('new_end_date', '').strip(),
+        'new_value': request.form.get('new_value', '').strip()
+    }
+    
+    file = request.files.get('file')
+    
+    # Call service
+    result = contract_service.renew_contract(instance_id, data, file, current_user_id)
+    invalidate_contract_list()
+    
+    return success_response(result, message='Contract renewed successfully', status=201)
 
 
 @contracts_bp.route('/extract', methods=['POST'])
@@ -349,62 +323,36 @@ def extract_contract_data():
             }
         }
     """
+    file = request.files.get('file')
+    
+    if not file or not file.filename:
+        return error_response('No file provided', 400)
+    
+    # Validate file type (PDF or Word)
+    _, dot, file_ext = file.filename.rpartition('.')
+    
+    if not dot or file_ext.lower() not in EXTRACTION_EXTENSIONS:
+        return error_response('Only PDF and Word documents supported (.pdf, .docx, .doc)', 400)
+    
+    current_app.logger.info('NER extraction', extra={'file_name': file.filename})
+    
+    # Run NER extraction in the extraction pool (see extraction_pool) - the
+    # upload is sent over as bytes, no temp copy to write and remove
+    file.stream.seek(0)
     try:
-        file = request.files.get('file')
-        
-        if not file or not file.filename:
-            return jsonify({
-                'success': False,
-                'error': 'No file provided'
-            }), 400
-        
-        # Validate file type (PDF or Word)
-        allowed_extensions = ['.pdf', '.docx', '.doc']
-        file_ext = '.' + file.filename.rsplit('.', 1)[1].lower() if '.' in file.filename else ''
-        
-        if file_ext not in allowed_extensions:
-            return jsonify({
-                'success': False,
-                'error': 'Only PDF and Word documents supported (.pdf, .docx, .doc)'
-            }), 400
-        
-        # Save temp file
-        filename = secure_filename(file.filename)
-        temp_dir = '/tmp/contract_extraction'
-        os.makedirs(temp_dir, exist_ok=True)
-        temp_path = os.path.join(temp_dir, filename)
-        file.save(temp_path)
-        
-        print(f"\n🚀 NER Extraction: {filename}")
-        
-        # Run NER extraction
-        extracted_data = extraction_service.extract_from_pdf(temp_path)
-        
-        # Clean up
-        os.remove(temp_path)
-        
-        return jsonify({
-            'success': True,
-            'message': 'Data extracted using NER',
-            'data': extracted_data,
-            'model': 'spaCy en_core_web_sm v3.8.0'
-        }), 200
-        
-    except Exception as e:
-        print(f"❌ Error: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        extracted_data = extract_document(file.stream.read(), file.filename)
+    except TimeoutError:
+        return error_response('Extraction timed out', 504)
+    
+    return success_response(extracted_data, message='Data extracted using NER', model='spaCy en_core_web_sm v3.8.0')
 
 
-@contracts_bp.route('/<string:instance_id>/history', methods=['GET', 'OPTIONS'])
+@contracts_bp.route('/<string:instance_id>/history', methods=['GET'])
+@jwt_required()
 def get_contract_history(instance_id):
     """
     Get activity history for a contract
     
-    Handles CORS preflight (OPTIONS) and actual GET request
-    
     Response:
         {
             "success": true,
@@ -437,34 +385,10 @@ def get_contract_history(instance_id):
             ]
         }
     """
-    # Handle CORS preflight
-    if request.method == 'OPTIONS':
-        return '', 200
+    # Get all activities for this contract, newest first
+    activities = ActivityHistory.query\
+        .filter_by(contract_instance_id=instance_id)\
+        .order_by(ActivityHistory.timestamp.desc())\
+        .all()
     
-    # For GET requests, require JWT
-    try:
-        from flask_jwt_extended import verify_jwt_in_request
-        verify_jwt_in_request()
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': 'Authentication required'
-        }), 401
-    
-    try:
-        # Get all activities for this contract, newest first
-        activities = ActivityHistory.query\
-            .filter_by(contract_instance_id=instance_id)\
-            .order_by(ActivityHistory.timestamp.desc())\
-            .all()
-        
-        return jsonify({
-            'success': True,
-            'data': [activity.to_dict() for activity in activities]
-        }), 200
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    return success_response([activity.to_dict() for activity in activities])
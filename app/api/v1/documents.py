@@ -1,15 +1,21 @@
 """Document management API endpoints"""
 
 import os
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, send_file
 from flask_jwt_extended import jwt_required
 from app.extensions import db
 from app.models.document import Document
+from app.services.storage_service import StorageService
+from app.utils.responses import success_response, error_response
 
 documents_bp = Blueprint('documents', __name__)
 
+# Initialize services
+storage_service = StorageService()
 
-@documents_bp.route('/<int:document_id>/download', methods=['GET', 'OPTIONS'])
+
+@documents_bp.route('/<int:document_id>/download', methods=['GET'])
+@jwt_required()
 def download_document(document_id):
     """
     Download a document file
@@ -24,56 +30,31 @@ def download_document(document_id):
         GET /api/documents/123/download
         Returns the file with proper headers
     """
-    # Handle CORS preflight
-    if request.method == 'OPTIONS':
-        return '', 200
+    # Get document from database
+    document = db.session.get(Document, document_id)
     
-    # For GET, require JWT
-    try:
-        from flask_jwt_extended import verify_jwt_in_request
-        verify_jwt_in_request()
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': 'Authentication required'
-        }), 401
+    if not document:
+        return error_response('Document not found', 404)
     
+    # Handle both absolute and relative paths
+    file_path = document.file_path
+    if not os.path.isabs(file_path):
+        # Convert relative path to absolute
+        file_path = os.path.abspath(file_path)
+    
+    # Send file with proper headers. send_file passes the open file to the
+    # server's wsgi.file_wrapper, so gunicorn writes it with sendfile(2)
+    # instead of copying it through Python. It stats the file itself, so a
+    # missing file shows up here rather than needing an exists() check first
     try:
-        # Get document from database
-        document = Document.query.get(document_id)
-        
-        if not document:
-            return jsonify({
-                'success': False,
-                'error': 'Document not found'
-            }), 404
-        
-        # Handle both absolute and relative paths
-        file_path = document.file_path
-        if not os.path.isabs(file_path):
-            # Convert relative path to absolute
-            file_path = os.path.abspath(file_path)
-        
-        # Check if file exists
-        if not os.path.exists(file_path):
-            return jsonify({
-                'success': False,
-                'error': f'File not found on server: {file_path}'
-            }), 404
-        
-        # Send file with proper headers
         return send_file(
             file_path,
             as_attachment=True,
             download_name=document.document_name,
             mimetype='application/octet-stream'
         )
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    except FileNotFoundError:
+        return error_response(f'File not found on server: {file_path}', 404)
 
 
 @documents_bp.route('/<int:document_id>', methods=['DELETE'])
@@ -88,31 +69,18 @@ def delete_document(document_id):
             "message": "Document deleted successfully"
         }
     """
-    try:
-        document = Document.query.get(document_id)
-        
-        if not document:
-            return jsonify({
-                'success': False,
-                'error': 'Document not found'
-            }), 404
-        
-        # Delete file from filesystem
-        if os.path.exists(document.file_path):
-            os.remove(document.file_path)
-        
-        # Delete database record
-        db.session.delete(document)
-        db.session.commit()
-        
-        return jsonify({
-            'success': True,
-            'message': 'Document deleted successfully'
-        }), 200
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    document = db.session.get(Document, document_id)
+    
+    if not document:
+        return error_response('Document not found', 404)
+    
+    file_path = document.file_path
+    
+    # Delete database record
+    db.session.delete(document)
+    db.session.commit()
+    
+    # Remove the file once the record is gone, off the request thread
+    storage_service.delete_file_in_background(file_path)
+    
+    return success_response(message='Document deleted successfully')
@@ -1,9 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
-from flask_cors import CORS
 from flask_migrate import Migrate
 
 db = SQLAlchemy()
 jwt = JWTManager()
-cors = CORS()
 migrate = Migrate()
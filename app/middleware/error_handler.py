@@ -0,0 +1,41 @@
+"""Application-wide error handlers"""
+
+from flask import request
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
+from app.extensions import db
+from app.utils.responses import error_response
+
+
+def register_error_handlers(app):
+    """
+    Map exceptions raised by route handlers to standard JSON error responses
+
+    - ValueError: validation / business rule failure -> 400
+    - RequestEntityTooLarge: body over the size limit while being read -> 413
+    - HTTPException: passed through unchanged (404 routes, 405, 413, ...)
+    - anything else -> 500, after rolling back the session
+    """
+
+    @app.errorhandler(ValueError)
+    def handle_value_error(e):
+        db.session.rollback()
+        return error_response(str(e), 400)
+
+    @app.errorhandler(RequestEntityTooLarge)
+    def handle_request_too_large(e):
+        # Raised mid-parse (e.g. a JSON body over MAX_JSON_CONTENT_LENGTH) -
+        # same envelope as the up-front Content-Length check
+        limit = request.max_content_length
+        if limit:
+            return error_response(f'Request too large. Maximum size is {limit / (1024 * 1024):g} MB', 413)
+        return error_response('Request too large', 413)
+
+    @app.errorhandler(HTTPException)
+    def handle_http_exception(e):
+        return e
+
+    @app.errorhandler(Exception)
+    def handle_exception(e):
+        app.logger.exception('Unhandled exception')
+        db.session.rollback()
+        return error_response(str(e), 500)
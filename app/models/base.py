@@ -1,7 +1,31 @@
-from datetime import datetime
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
 from app.extensions import db
 
+
+class utcnow(FunctionElement):
+    """Current UTC time, evaluated by the database as part of the INSERT/UPDATE"""
+    type = db.DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    return 'CURRENT_TIMESTAMP'
+
+
+@compiles(utcnow, 'postgresql')
+def _pg_utcnow(element, compiler, **kw):
+    # Columns are timestamp without time zone holding UTC
+    return "TIMEZONE('utc', statement_timestamp())"
+
+
+@compiles(utcnow, 'sqlite')
+def _sqlite_utcnow(element, compiler, **kw):
+    return "STRFTIME('%Y-%m-%d %H:%M:%f', 'now')"
+
+
 class TimestampMixin:
     """Mixin to add created_at and updated_at timestamps"""
-    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=utcnow())
+    updated_at = db.Column(db.DateTime, onupdate=utcnow())
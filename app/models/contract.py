@@ -5,10 +5,14 @@ import uuid
 class Contract(db.Model, TimestampMixin):
     """Contract model with versioning support"""
     __tablename__ = 'contracts'
+    __table_args__ = (
+        # Versions of one contract, in version order (also serves lookups by id alone)
+        db.Index('ix_contracts_id_version', 'id', 'version'),
+    )
     
     # Primary key is contract_instance_id (with version)
     contract_instance_id = db.Column(db.String(100), primary_key=True)  # e.g., CTR_550e8400-e29b-41d4-a716-446655440000_V1
-    id = db.Column(db.String(50), nullable=False, index=True)  # UUID - Groups versions together
+    id = db.Column(db.String(50), nullable=False)  # UUID - Groups versions together
     contract_name = db.Column(db.String(255), nullable=False)
     client_name = db.Column(db.String(255), nullable=False, index=True)
     
@@ -32,7 +36,7 @@ class Contract(db.Model, TimestampMixin):
     
     # Relationships
     # Note: contract_type and status relationships are defined via backrefs in ContractType and ContractStatus models
-    documents = db.relationship('Document', backref='contract', lazy='dynamic', cascade='all, delete-orphan')
+    documents = db.relationship('Document', backref='contract', lazy='selectin', cascade='all, delete-orphan')
     
     @staticmethod
     def generate_contract_id():
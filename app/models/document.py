@@ -1,5 +1,5 @@
 from app.extensions import db
-from app.models.base import TimestampMixin
+from app.models.base import TimestampMixin, utcnow
 
 class Document(db.Model, TimestampMixin):
     """Document model for contract files and supporting documents"""
@@ -17,7 +17,7 @@ class Document(db.Model, TimestampMixin):
     uploaded_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     
     # Metadata
-    uploaded_at = db.Column(db.DateTime, nullable=False)
+    uploaded_at = db.Column(db.DateTime, nullable=False, default=utcnow())
     
     def __repr__(self):
         return f'<Document {self.document_name} - Contract: {self.contract_instance_id}>'
@@ -2,6 +2,10 @@ from app.extensions import db
 from app.models.base import TimestampMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 
+# Pinned rather than left to Werkzeug's default, so existing hashes can be
+# recognised as outdated (e.g. pbkdf2 at up to 1M iterations, ~3x slower to check)
+PASSWORD_HASH_METHOD = 'scrypt:32768:8:1'
+
 class User(db.Model, TimestampMixin):
     """User model for authentication and authorization"""
     __tablename__ = 'users'
@@ -20,12 +24,16 @@ class User(db.Model, TimestampMixin):
     
     def set_password(self, password):
         """Hash and set the user password"""
-        self.password = generate_password_hash(password)
+        self.password = generate_password_hash(password, method=PASSWORD_HASH_METHOD)
     
     def check_password(self, password):
         """Check if provided password matches the hash"""
         return check_password_hash(self.password, password)
     
+    def password_needs_rehash(self):
+        """Check if the stored hash was made with something other than PASSWORD_HASH_METHOD"""
+        return not self.password.startswith(PASSWORD_HASH_METHOD + '$')
+    
     @property
     def full_name(self):
         """Return user's full name"""
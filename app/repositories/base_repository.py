@@ -1,7 +1,8 @@
 """Base repository with common CRUD operations"""
 
+from sqlalchemy import insert
 from app.extensions import db
-from typing import TypeVar, Generic, List, Optional, Dict, Any
+from typing import TypeVar, Generic, Iterator, List, Optional, Dict, Any
 
 T = TypeVar('T')
 
@@ -10,6 +11,9 @@ class BaseRepository(Generic[T]):
     """
     Base repository providing common database operations.
     Inherit from this to get standard CRUD functionality.
+    
+    Writes are flushed, not committed - the caller commits once for the
+    whole operation with commit().
     """
     
     def __init__(self, model: type[T]):
@@ -23,7 +27,7 @@ class BaseRepository(Generic[T]):
     
     def create(self, data: Dict[str, Any]) -> T:
         """
-        Create a new record
+        Create a new record (flushed, so generated keys are available)
         
         Args:
             data: Dictionary of field values
@@ -33,9 +37,22 @@ class BaseRepository(Generic[T]):
         """
         instance = self.model(**data)
         db.session.add(instance)
-        db.session.commit()
+        db.session.flush()
         return instance
     
+    def create_many(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Insert several records in one statement
+        
+        Core executemany INSERT - batched into multi-row VALUES by the
+        driver, with no ORM instances built.
+        
+        Args:
+            rows: Field values for each record (all with the same keys)
+        """
+        if rows:
+            db.session.execute(insert(self.model), rows)
+    
     def find_by_id(self, id: Any) -> Optional[T]:
         """
         Find record by primary key
@@ -46,7 +63,7 @@ class BaseRepository(Generic[T]):
         Returns:
             Model instance or None
         """
-        return self.model.query.get(id)
+        return db.session.get(self.model, id)
     
     def find_one(self, **filters) -> Optional[T]:
         """
@@ -75,6 +92,41 @@ class BaseRepository(Generic[T]):
             query = query.filter_by(**filters)
         return query.all()
     
+    def iter_all(self, batch_size: int = 500) -> Iterator[T]:
+        """
+        Iterate over all records, fetched batch_size rows at a time
+        
+        A server-side cursor on PostgreSQL, so memory stays bounded by the
+        batch however big the table is. Valid while the session is open.
+        
+        Args:
+            batch_size: Rows fetched per round trip
+            
+        Returns:
+            Iterator of model instances
+        """
+        return iter(self.model.query.yield_per(batch_size))
+    
+    def list_page(self, after: Any = None, limit: int = 100) -> List[T]:
+        """
+        Get one page of records ordered by primary key
+        
+        Keyset pagination - the page resumes after the last key seen,
+        a primary key range scan instead of skipping rows with OFFSET.
+        
+        Args:
+            after: Primary key of the last record of the previous page
+            limit: Maximum number of records
+            
+        Returns:
+            List of model instances
+        """
+        pk = self.model.__mapper__.primary_key[0]
+        query = self.model.query
+        if after is not None:
+            query = query.filter(pk > after)
+        return query.order_by(pk).limit(limit).all()
+    
     def update(self, id: Any, data: Dict[str, Any]) -> Optional[T]:
         """
         Update record by ID
@@ -94,7 +146,7 @@ class BaseRepository(Generic[T]):
             if hasattr(instance, key):
                 setattr(instance, key, value)
         
-        db.session.commit()
+        db.session.flush()
         return instance
     
     def delete(self, id: Any) -> bool:
@@ -112,7 +164,7 @@ class BaseRepository(Generic[T]):
             return False
         
         db.session.delete(instance)
-        db.session.commit()
+        db.session.flush()
         return True
     
     def count(self, **filters) -> int:
@@ -134,10 +186,21 @@ class BaseRepository(Generic[T]):
         """
         Check if record exists
         
+        SELECT EXISTS(...) - the database stops at the first match and no
+        row or model instance comes back.
+        
         Args:
             **filters: Field filters
             
         Returns:
             True if exists, False otherwise
         """
-        return self.find_one(**filters) is not None
+        return db.session.query(self.model.query.filter_by(**filters).exists()).scalar()
+    
+    def commit(self):
+        """Commit current transaction"""
+        db.session.commit()
+    
+    def rollback(self):
+        """Rollback current transaction"""
+        db.session.rollback()
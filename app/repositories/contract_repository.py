@@ -1,10 +1,13 @@
 """Contract repository for database operations"""
 
-from typing import Optional, List
-from datetime import datetime
-from sqlalchemy import func
+from typing import Dict, Optional, List
+from sqlalchemy import func, select, insert, update, Row, Result, Select
+from sqlalchemy.orm import joinedload, selectinload, lazyload, raiseload
 from app.repositories.base_repository import BaseRepository
 from app.models.contract import Contract
+from app.models.contract_type import ContractType
+from app.models.contract_status import ContractStatus
+from app.models.user import User
 from app.extensions import db
 
 
@@ -24,16 +27,116 @@ class ContractRepository(BaseRepository[Contract]):
         Returns:
             Contract or None
         """
-        return self.model.query.filter_by(contract_instance_id=instance_id).first()
+        # Primary key lookup - served from the identity map if already loaded.
+        # Write paths don't read the documents - skip the selectin load
+        return db.session.get(Contract, instance_id, options=[lazyload(Contract.documents)])
     
-    def find_all_with_details(self) -> List[Contract]:
+    def find_by_instance_id_with_details(self, instance_id: str) -> Optional[Contract]:
+        """
+        Find contract by instance ID with type, status, creator and documents loaded
+        
+        Args:
+            instance_id: Contract instance ID with version
+            
+        Returns:
+            Contract or None
+        """
+        contracts = self.find_many_with_details([instance_id])
+        return contracts[0] if contracts else None
+    
+    def find_many_with_details(self, instance_ids: List[str]) -> List[Contract]:
+        """
+        Find several contracts by instance ID with type, status, creator and documents loaded
+        
+        One query for the contracts (plus one IN query for all their
+        documents), however many IDs are passed. Only the creator's email
+        is selected from users - that's all the contract views show.
+        
+        Args:
+            instance_ids: Contract instance IDs with version
+            
+        Returns:
+            List of contracts found (in no particular order)
+        """
+        if not instance_ids:
+            return []
+        return self.model.query.options(
+            joinedload(Contract.contract_type),
+            joinedload(Contract.status),
+            joinedload(Contract.creator).load_only(User.email),
+            selectinload(Contract.documents),
+            raiseload('*')
+        ).filter(Contract.contract_instance_id.in_(instance_ids)).all()
+    
+    @staticmethod
+    def _details_select() -> Select:
+        """
+        Contract list query: only the columns the list renders, joined with
+        the type/status names and creator email, so no ORM instances are built
+        """
+        return (
+            select(
+                Contract.contract_instance_id,
+                Contract.id,
+                Contract.contract_name,
+                Contract.client_name,
+                ContractType.name.label('contract_type_name'),
+                Contract.start_date,
+                Contract.end_date,
+                Contract.value,
+                ContractStatus.name.label('status_name'),
+                Contract.description,
+                Contract.version,
+                Contract.renewed_from,
+                Contract.renewed_to,
+                Contract.created_at,
+                User.email.label('creator_email'),
+                Contract.updated_at
+            )
+            .join(ContractType, ContractType.id == Contract.contract_type_id)
+            .join(ContractStatus, ContractStatus.id == Contract.status_id)
+            .join(User, User.id == Contract.created_by)
+            .order_by(Contract.contract_instance_id)
+        )
+    
+    def find_all_with_details(self, limit: Optional[int] = None, after: Optional[str] = None) -> List[Row]:
         """
         Get all contracts with related data (type, status, creator)
         
+        Rows are ordered by instance ID, so a page can resume after the last
+        ID seen (keyset pagination - a primary key range scan, no OFFSET).
+        
+        Args:
+            limit: Maximum number of rows (None for all)
+            after: Only return contracts whose instance ID sorts after this one
+            
         Returns:
-            List of contracts with relationships loaded
+            List of rows (contract columns plus contract_type_name,
+            status_name and creator_email)
         """
-        return self.model.query.all()
+        stmt = self._details_select()
+        if after:
+            stmt = stmt.where(Contract.contract_instance_id > after)
+        if limit:
+            stmt = stmt.limit(limit)
+        return db.session.execute(stmt).all()
+    
+    def iter_all_with_details(self, batch_size: int = 500) -> Result:
+        """
+        Execute the contract list query and fetch its rows in batches
+        
+        Same rows as find_all_with_details(), but the result is fetched
+        batch_size rows at a time (a server-side cursor on PostgreSQL)
+        instead of being loaded all at once.
+        
+        Args:
+            batch_size: Rows fetched per round trip
+            
+        Returns:
+            Result to iterate over (valid while the session is open)
+        """
+        stmt = self._details_select().execution_options(yield_per=batch_size)
+        return db.session.execute(stmt)
     
     def find_by_contract_id(self, contract_id: str) -> List[Contract]:
         """
@@ -59,6 +162,30 @@ class ContractRepository(BaseRepository[Contract]):
         """
         return self.model.query.filter_by(id=contract_id).order_by(Contract.version.desc()).first()
     
+    def get_latest_versions(self, contract_ids: List[str]) -> Dict[str, Contract]:
+        """
+        Get the latest version of several contracts in one query
+        
+        Args:
+            contract_ids: Base contract IDs
+            
+        Returns:
+            Dict of base contract ID -> latest version (IDs not found are left out)
+        """
+        if not contract_ids:
+            return {}
+        latest = (
+            select(Contract.id, func.max(Contract.version).label('version'))
+            .where(Contract.id.in_(contract_ids))
+            .group_by(Contract.id)
+            .subquery()
+        )
+        contracts = self.model.query.join(
+            latest,
+            (Contract.id == latest.c.id) & (Contract.version == latest.c.version)
+        ).all()
+        return {contract.id: contract for contract in contracts}
+    
     def get_max_version(self, contract_id: str) -> int:
         """
         Get the maximum version number for a contract
@@ -85,10 +212,37 @@ class ContractRepository(BaseRepository[Contract]):
             Created contract
         """
         contract = Contract(**contract_data)
+        # No flush - the primary key is generated client-side, so the INSERT
+        # can wait for the commit and go out with the rest of the unit of work
         db.session.add(contract)
-        db.session.flush()  # Get ID without committing
         return contract
     
+    def insert_contract(self, contract_data: dict) -> None:
+        """
+        Insert a contract row without building an ORM instance
+        
+        Core INSERT - for callers that don't use the contract object
+        afterwards, so there's no unit-of-work bookkeeping for it.
+        
+        Args:
+            contract_data: Contract field values
+        """
+        db.session.execute(insert(Contract).values(**contract_data))
+    
+    def update_fields(self, instance_id: str, values: dict) -> None:
+        """
+        Set column values on a contract with a single UPDATE statement
+        
+        Args:
+            instance_id: Contract instance ID
+            values: Column values to set
+        """
+        db.session.execute(
+            update(Contract)
+            .where(Contract.contract_instance_id == instance_id)
+            .values(**values)
+        )
+    
     def update_contract(self, instance_id: str, updates: dict) -> Optional[Contract]:
         """
         Update contract fields
@@ -108,13 +262,4 @@ class ContractRepository(BaseRepository[Contract]):
             if hasattr(contract, key):
                 setattr(contract, key, value)
         
-        contract.updated_at = datetime.utcnow()
         return contract
-    
-    def commit(self):
-        """Commit current transaction"""
-        db.session.commit()
-    
-    def rollback(self):
-        """Rollback current transaction"""
-        db.session.rollback()
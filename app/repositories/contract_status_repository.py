@@ -1,6 +1,7 @@
 """Contract Status repository for database operations"""
 
-from typing import Optional
+from typing import Dict, Optional
+from sqlalchemy import select
 from app.repositories.base_repository import BaseRepository
 from app.models.contract_status import ContractStatus
 from app.extensions import db
@@ -9,6 +10,10 @@ from app.extensions import db
 class ContractStatusRepository(BaseRepository[ContractStatus]):
     """Repository for contract status-related database operations"""
     
+    # name -> id and id -> name, loaded on first use - the table is effectively a static enum
+    _id_cache: Dict[str, int] = {}
+    _name_cache: Dict[int, str] = {}
+    
     def __init__(self):
         super().__init__(ContractStatus)
     
@@ -34,22 +39,50 @@ class ContractStatusRepository(BaseRepository[ContractStatus]):
         Returns:
             Status ID or None
         """
-        status = self.find_by_name(name)
-        return status.id if status else None
+        cached_id = self._id_cache.get(name)
+        if cached_id is None:
+            # Unknown name - reload in case the table changed since startup
+            self._load_id_cache()
+            cached_id = self._id_cache.get(name)
+        return cached_id
     
-    def get_all_statuses(self):
+    def get_name_by_id(self, status_id: int) -> Optional[str]:
         """
-        Get all contract statuses
+        Get contract status name by ID
         
+        Args:
+            status_id: Status ID
+            
         Returns:
-            List of all ContractStatus records
+            Status name or None
         """
-        return self.find_all()
+        cached_name = self._name_cache.get(status_id)
+        if cached_name is None:
+            self._load_id_cache()
+            cached_name = self._name_cache.get(status_id)
+        return cached_name
+    
+    def _load_id_cache(self):
+        """Load every name <-> id pair in one query"""
+        rows = db.session.execute(select(self.model.name, self.model.id)).all()
+        cls = type(self)
+        cls._id_cache = dict(rows)
+        cls._name_cache = {row_id: name for name, row_id in rows}
     
-    def commit(self):
-        """Commit current transaction"""
-        db.session.commit()
+    @classmethod
+    def clear_cache(cls):
+        """Drop cached ids - call after writing to the lookup table"""
+        cls._id_cache = {}
+        cls._name_cache = {}
     
-    def rollback(self):
-        """Rollback current transaction"""
-        db.session.rollback()
+    def get_all_statuses(self):
+        """
+        Get all contract statuses
+        
+        Returns:
+            List of (id, name, description) rows - only the columns the
+            lookup endpoint needs, without hydrating ContractStatus instances
+        """
+        return db.session.execute(
+            select(self.model.id, self.model.name, self.model.description)
+        ).all()
@@ -2,6 +2,7 @@
 
 from typing import Optional, List
 from datetime import datetime
+from sqlalchemy import insert, Row
 from app.repositories.base_repository import BaseRepository
 from app.models.document import Document
 from app.extensions import db
@@ -36,10 +37,44 @@ class DocumentRepository(BaseRepository[Document]):
             Created document
         """
         document = Document(**document_data)
+        # Inserted on commit together with the rest of the unit of work
         db.session.add(document)
-        db.session.flush()
         return document
     
+    def insert_document(self, document_data: dict) -> Row:
+        """
+        Insert a document row and return its generated values
+        
+        Core INSERT ... RETURNING - the ID and database-set upload time come
+        back with the insert, so there's no ORM instance to refresh after commit.
+        
+        Args:
+            document_data: Document field values
+            
+        Returns:
+            Row with the new document's id and uploaded_at
+        """
+        stmt = insert(Document).values(**document_data).returning(Document.id, Document.uploaded_at)
+        return db.session.execute(stmt).one()
+    
+    def create_many(self, rows: List[dict]) -> List[int]:
+        """
+        Insert several documents in one statement
+        
+        Executemany INSERT ... RETURNING - sent as multi-row VALUES batches,
+        with no ORM instances built.
+        
+        Args:
+            rows: Field values for each document (all with the same keys)
+            
+        Returns:
+            New document IDs, in the order of rows
+        """
+        if not rows:
+            return []
+        stmt = insert(Document).returning(Document.id, sort_by_parameter_order=True)
+        return list(db.session.execute(stmt, rows).scalars())
+    
     def delete_by_id(self, document_id: int) -> Optional[Document]:
         """
         Delete document by ID
@@ -54,11 +89,3 @@ class DocumentRepository(BaseRepository[Document]):
         if document:
             db.session.delete(document)
         return document
-    
-    def commit(self):
-        """Commit current transaction"""
-        db.session.commit()
-    
-    def rollback(self):
-        """Rollback current transaction"""
-        db.session.rollback()
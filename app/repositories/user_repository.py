@@ -1,6 +1,8 @@
 """User repository for database operations"""
 
 from typing import Optional
+from sqlalchemy import select, Row
+from sqlalchemy.orm import load_only
 from app.repositories.base_repository import BaseRepository
 from app.models.user import User
 from app.extensions import db
@@ -16,13 +18,32 @@ class UserRepository(BaseRepository[User]):
         """
         Find user by email address
         
+        Loads the login fields only - the timestamps are loaded on access.
+        
         Args:
             email: User email
             
         Returns:
             User or None
         """
-        return self.model.query.filter_by(email=email).first()
+        return self.model.query.options(
+            load_only(User.id, User.email, User.password, User.first_name, User.last_name, User.role)
+        ).filter_by(email=email).first()
+    
+    def find_profile(self, user_id: int) -> Optional[Row]:
+        """
+        Get the public fields of a user, without building a User instance
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            Row with id, email, first_name, last_name and role, or None
+        """
+        stmt = select(
+            User.id, User.email, User.first_name, User.last_name, User.role
+        ).where(User.id == user_id)
+        return db.session.execute(stmt).first()
     
     def find_by_username(self, username: str) -> Optional[User]:
         """
@@ -47,11 +68,3 @@ class UserRepository(BaseRepository[User]):
             True if exists, False otherwise
         """
         return self.exists(email=email)
-    
-    def commit(self):
-        """Commit current transaction"""
-        db.session.commit()
-    
-    def rollback(self):
-        """Rollback current transaction"""
-        db.session.rollback()
@@ -1,5 +1,7 @@
 """Authentication service for user authentication and authorization"""
 
+import threading
+import time
 from typing import Dict, Optional
 from flask_jwt_extended import create_access_token
 from app.repositories.user_repository import UserRepository
@@ -8,9 +10,86 @@ from app.repositories.user_repository import UserRepository
 class AuthService:
     """Service for authentication-related business logic"""
     
+    # /me is polled frequently - keep user info briefly to skip the DB round-trip
+    USER_CACHE_TTL_SECONDS = 10
+    USER_CACHE_MAX_SIZE = 1024
+    
+    # Failed logins per email before further attempts are refused for the
+    # rest of the window - no user lookup or password hashing while blocked.
+    # Counted per worker process. The block refuses the right password too,
+    # so anyone who knows an address can lock its user out for a window.
+    LOGIN_MAX_FAILURES = 5
+    LOGIN_FAILURE_WINDOW_SECONDS = 300
+    LOGIN_FAILURES_MAX_SIZE = 10000
+    
     def __init__(self):
         """Initialize auth service with dependencies"""
         self.user_repo = UserRepository()
+        self._user_cache = {}  # user_id -> (expires_at, user info dict)
+        self._login_failures = {}  # email -> (window_expires_at, failure count), oldest window first
+        self._login_failures_lock = threading.Lock()
+    
+    def login_blocked(self, email: str) -> bool:
+        """
+        Check if logins for an email are refused after repeated failures
+        
+        Emails are compared case-insensitively, so case variants of an
+        address share one failure count.
+        
+        Args:
+            email: User email
+            
+        Returns:
+            True if the failure limit was reached within the current window
+        """
+        key = self._login_key(email)
+        with self._login_failures_lock:
+            failures = self._login_failures.get(key)
+            if not failures:
+                return False
+            if failures[0] <= time.monotonic():
+                del self._login_failures[key]
+                return False
+            return failures[1] >= self.LOGIN_MAX_FAILURES
+    
+    @staticmethod
+    def _login_key(email: str) -> str:
+        """Failure counter key for an email"""
+        return email.strip().lower()
+    
+    def _record_login_failure(self, email: str) -> None:
+        """Count a failed login against the email's current window"""
+        email = self._login_key(email)
+        now = time.monotonic()
+        with self._login_failures_lock:
+            failures = self._login_failures.get(email)
+            if failures and failures[0] > now:
+                self._login_failures[email] = (failures[0], failures[1] + 1)
+                return
+            # A new window goes to the end, keeping the dict in window order
+            self._login_failures.pop(email, None)
+            if len(self._login_failures) >= self.LOGIN_FAILURES_MAX_SIZE:
+                self._evict_login_failures(now)
+            if len(self._login_failures) < self.LOGIN_FAILURES_MAX_SIZE:
+                self._login_failures[email] = (now + self.LOGIN_FAILURE_WINDOW_SECONDS, 1)
+    
+    def _evict_login_failures(self, now: float) -> None:
+        """
+        Make room in the failure counters (caller holds the lock)
+        
+        Expired windows go first, then the oldest emails that aren't blocked.
+        Live blocks are never evicted - otherwise failures on made-up emails
+        would lift them.
+        """
+        target = self.LOGIN_FAILURES_MAX_SIZE * 9 // 10
+        for email, (expires_at, count) in list(self._login_failures.items()):
+            if expires_at <= now:
+                del self._login_failures[email]
+        for email, (expires_at, count) in list(self._login_failures.items()):
+            if len(self._login_failures) <= target:
+                break
+            if count < self.LOGIN_MAX_FAILURES:
+                del self._login_failures[email]
     
     def login(self, email: str, password: str) -> Dict:
         """
@@ -33,13 +112,19 @@ class AuthService:
         # Find user
         user = self.user_repo.find_by_email(email)
         
-        if not user:
-            raise ValueError('Invalid email or password')
-        
         # Verify password
-        if not user.check_password(password):
+        if not user or not user.check_password(password):
+            self._record_login_failure(email)
             raise ValueError('Invalid email or password')
         
+        with self._login_failures_lock:
+            self._login_failures.pop(self._login_key(email), None)
+        
+        # Upgrade legacy hashes while the plaintext is at hand
+        if user.password_needs_rehash():
+            user.set_password(password)
+            self.user_repo.commit()
+        
         # Generate JWT token
         access_token = create_access_token(identity=str(user.id))
         
@@ -64,18 +149,23 @@ class AuthService:
         Returns:
             User info dict or None if not found
         """
-        user = self.user_repo.find_by_id(user_id)
+        now = time.monotonic()
+        cached = self._user_cache.get(user_id)
+        if cached and cached[0] > now:
+            return cached[1]
+        
+        user = self.user_repo.find_profile(user_id)
         
         if not user:
             return None
         
-        return {
-            'id': user.id,
-            'email': user.email,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'role': user.role
-        }
+        user_data = user._asdict()
+        
+        if len(self._user_cache) >= self.USER_CACHE_MAX_SIZE:
+            self._user_cache.clear()
+        self._user_cache[user_id] = (now + self.USER_CACHE_TTL_SECONDS, user_data)
+        
+        return user_data
     
     def register(self, data: Dict) -> Dict:
         """
@@ -108,6 +198,7 @@ class AuthService:
             'role': data.get('role', 'user'),  # Default role
             'password': data['password']  # Will be hashed by User model
         })
+        self.user_repo.commit()
         
         return {
             'id': user.id,
@@ -17,22 +17,36 @@ How It Works:
 1. Extract text from PDF (PyPDF2) or Word (python-docx)
 2. Run spaCy NER pipeline:
    - Tokenization (split into words)
-   - POS tagging (noun, verb, etc.)
-   - Dependency parsing (grammar structure)
    - Named Entity Recognition (identify entities)
+   (tagger/parser/lemmatizer aren't loaded - only entities are used)
 3. Extract specific entities we need for contracts
 4. Apply heuristics for accuracy
 """
 
+import logging
 import re
 import os
 import spacy
-from typing import Dict, Optional, List
+from typing import BinaryIO, Dict, Optional, List, Union
 from datetime import datetime
 from dateutil import parser as date_parser
 from PyPDF2 import PdfReader
 from docx import Document  # For Word documents
 
+# Runs in extraction pool processes as well, where there's no Flask app
+logger = logging.getLogger(__name__)
+
+# Extension -> reader; .doc goes through the Word reader as before
+_FILE_TYPES = {'pdf': 'pdf', 'docx': 'docx', 'doc': 'docx'}
+
+# ORG entities that are generic words rather than a client name
+_ORG_FALSE_POSITIVES = frozenset({'agreement', 'contract', 'llc'})
+
+# Pipeline components extraction never reads (only doc.ents is used). In
+# en_core_web_sm the NER has its own embedding layer, so the shared tok2vec
+# only feeds the tagger and parser and can go too
+_UNUSED_PIPES = ['tok2vec', 'tagger', 'parser', 'attribute_ruler', 'lemmatizer']
+
 
 class ContractExtractionService:
     """Extract contract metadata from PDFs and Word documents using NER"""
@@ -43,16 +57,16 @@ class ContractExtractionService:
         
         Loads: en_core_web_sm
         Components loaded:
-        - tok2vec: Token-to-vector embeddings
-        - tagger: Part-of-speech tagger
-        - parser: Dependency parser
         - ner: Named Entity Recognizer (this is what we use!)
-        - attribute_ruler: Set custom attributes
-        - lemmatizer: Word lemmatization
+        The rest of the pipeline (_UNUSED_PIPES) is excluded - it would
+        run on every document without anything reading its output.
         """
-        print("🔄 Loading spaCy NER model...")
-        self.nlp = spacy.load("en_core_web_sm")
-        print("✅ Model loaded successfully!")
+        logger.info("Loading spaCy NER model")
+        self.nlp = spacy.load("en_core_web_sm", exclude=_UNUSED_PIPES)
+        # First call allocates the model's working buffers - pay for it here
+        # rather than on the first document
+        self.nlp("Warm-up")
+        logger.info("spaCy NER model loaded")
         
         # Entity types we care about
         self.target_entities = ['ORG', 'DATE', 'MONEY', 'PERSON']
@@ -76,24 +90,50 @@ class ContractExtractionService:
                 'description': str
             }
         """
-        print(f"\n📄 Extracting from: {file_path}")
+        logger.debug("Extracting from: %s", file_path)
+        return self._extract(file_path, self._detect_file_type(file_path))
+    
+    def extract_from_stream(self, stream: BinaryIO, filename: str) -> Dict:
+        """
+        Extraction from an open binary file, e.g. an uploaded file's stream
+        
+        PyPDF2 and python-docx both read file objects, so an upload can be
+        parsed where it is instead of being copied to a temp path first.
+        
+        Args:
+            stream: Seekable binary file object
+            filename: Original file name - its extension picks the reader
+            
+        Returns:
+            Same dictionary as extract_from_pdf()
+        """
+        logger.debug("Extracting from: %s", filename)
+        stream.seek(0)
+        return self._extract(stream, self._detect_file_type(filename))
+    
+    def _extract(self, source: Union[str, BinaryIO], file_type: str) -> Dict:
+        """
+        Extract text from a file path or file object and run NER on it
         
-        # Step 1: Detect file type and extract text
-        file_type = self._detect_file_type(file_path)
-        print(f"📋 File type: {file_type.upper()}")
+        Args:
+            source: Path or binary file object
+            file_type: 'pdf', 'docx' or 'unknown' (see _detect_file_type)
+        """
+        # Step 1: Extract text
+        logger.debug("File type: %s", file_type)
         
         if file_type == 'pdf':
-            text = self._extract_text_from_pdf(file_path)
+            text = self._extract_text_from_pdf(source)
         elif file_type == 'docx':
-            text = self._extract_text_from_word(file_path)
+            text = self._extract_text_from_word(source)
         else:
             raise ValueError(f"Unsupported file type: {file_type}. Use PDF or DOCX")
         
-        print(f"📝 Extracted {len(text)} characters")
+        logger.debug("Extracted %d characters", len(text))
         
         # Step 2: Run NER on text
         doc = self.nlp(text[:5000])  # Limit to first 5000 chars for speed
-        print(f"🤖 NER found {len(doc.ents)} entities")
+        logger.debug("NER found %d entities", len(doc.ents))
         
         # Step 3: Extract specific fields
         result = {
@@ -106,10 +146,10 @@ class ContractExtractionService:
             'description': self._extract_description(text)
         }
         
-        print(f"✅ Extraction complete!")
+        logger.debug("Extraction complete")
         return result
     
-    def _extract_text_from_pdf(self, file_path: str) -> str:
+    def _extract_text_from_pdf(self, source: Union[str, BinaryIO]) -> str:
         """
         Extract text from PDF using PyPDF2
         
@@ -121,18 +161,18 @@ class ContractExtractionService:
         """
         text = ""
         try:
-            reader = PdfReader(file_path)
+            reader = PdfReader(source)
             for page in reader.pages:
                 page_text = page.extract_text()
                 if page_text:
                     text += page_text + "\n"
         except Exception as e:
-            print(f"❌ Error reading PDF: {str(e)}")
+            logger.warning("Error reading PDF: %s", e)
             return ""
         
         return text
     
-    def _extract_text_from_word(self, file_path: str) -> str:
+    def _extract_text_from_word(self, source: Union[str, BinaryIO]) -> str:
         """
         Extract text from Word document (.docx) using python-docx
         
@@ -147,7 +187,7 @@ class ContractExtractionService:
         """
         text = ""
         try:
-            doc = Document(file_path)
+            doc = Document(source)
             
             # Extract text from paragraphs
             for paragraph in doc.paragraphs:
@@ -163,7 +203,7 @@ class ContractExtractionService:
                 text += "\n"
             
         except Exception as e:
-            print(f"❌ Error reading Word document: {str(e)}")
+            logger.warning("Error reading Word document: %s", e)
             return ""
         
         return text
@@ -174,14 +214,10 @@ class ContractExtractionService:
         
         Returns: 'pdf', 'docx', or 'unknown'
         """
-        ext = os.path.splitext(file_path)[1].lower()
-        
-        if ext == '.pdf':
-            return 'pdf'
-        elif ext in ['.docx', '.doc']:
-            return 'docx'
-        else:
+        _, dot, ext = os.path.basename(file_path).rpartition('.')
+        if not dot:
             return 'unknown'
+        return _FILE_TYPES.get(ext.lower(), 'unknown')
     
     def _extract_client_name(self, doc, text: str) -> Optional[str]:
         """
@@ -205,11 +241,11 @@ class ContractExtractionService:
             # Filter out common false positives
             filtered_orgs = [
                 org for org in organizations 
-                if org.lower() not in ['agreement', 'contract', 'llc']
+                if org.lower() not in _ORG_FALSE_POSITIVES
             ]
             
             if filtered_orgs:
-                print(f"   🏢 Found organizations: {filtered_orgs[:3]}")
+                logger.debug("Found organizations: %s", filtered_orgs[:3])
                 # Return first valid organization (usually the client)
                 return filtered_orgs[0] if len(filtered_orgs) >= 1 else filtered_orgs[0]
         
@@ -237,7 +273,7 @@ class ContractExtractionService:
             line = line.strip()
             if any(kw in line.upper() for kw in ['AGREEMENT', 'CONTRACT']):
                 if 10 < len(line) < 100:
-                    print(f"   📋 Contract name: {line}")
+                    logger.debug("Contract name: %s", line)
                     return line
         
         return "Service Agreement"  # Default fallback
@@ -271,7 +307,7 @@ class ContractExtractionService:
         # Return type with highest score
         if max(scores.values()) > 0:
             best_type = max(scores, key=scores.get)
-            print(f"   📑 Contract type: {best_type} (score: {scores[best_type]})")
+            logger.debug("Contract type: %s (score: %d)", best_type, scores[best_type])
             return best_type
         
         return 'service'  # Default
@@ -318,8 +354,7 @@ class ContractExtractionService:
         valid_dates = self._parse_valid_dates(doc)
         
         if valid_dates:
-            print(f"   📅 Valid dates found: {valid_dates}")
-            print(f"   ✅ Start date: {valid_dates[0]}")
+            logger.debug("Valid dates found: %s, start date: %s", valid_dates, valid_dates[0])
             return valid_dates[0]
         
         return None
@@ -336,7 +371,7 @@ class ContractExtractionService:
         valid_dates = self._parse_valid_dates(doc)
         
         if len(valid_dates) >= 2:
-            print(f"   ✅ End date: {valid_dates[1]}")
+            logger.debug("End date: %s", valid_dates[1])
             return valid_dates[1]
         
         return None
@@ -359,7 +394,7 @@ class ContractExtractionService:
         money_entities = [ent.text for ent in doc.ents if ent.label_ == 'MONEY']
         
         if money_entities:
-            print(f"   💰 Found money: {money_entities[:3]}")
+            logger.debug("Found money: %s", money_entities[:3])
             
             for money_str in money_entities:
                 try:
@@ -376,7 +411,7 @@ class ContractExtractionService:
                     match = re.search(r'(\d+(?:\.\d+)?)', clean)
                     if match:
                         value = float(match.group(1))
-                        print(f"   ✅ Value: ${value:,.2f}")
+                        logger.debug("Value: %.2f", value)
                         return value
                 except:
                     continue
@@ -1,7 +1,8 @@
 """Contract service for business logic"""
 
-from datetime import datetime
-from typing import Dict, Optional, List
+from datetime import date
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Dict, Optional, List, Tuple, Iterator
 from werkzeug.datastructures import FileStorage
 from app.models.contract import Contract
 from app.repositories.contract_repository import ContractRepository
@@ -12,6 +13,89 @@ from app.repositories.contract_status_repository import ContractStatusRepository
 from app.services.storage_service import StorageService
 from app.utils.activity_logger import log_activity
 
+# Contract.value is Numeric(15, 2) - round to cents the way PostgreSQL does
+_CENTS = Decimal('0.01')
+
+
+def _parse_date(raw, required: bool = False) -> Optional[date]:
+    """
+    Parse a YYYY-MM-DD date
+    
+    Shared by create, update and renew - only the exact YYYY-MM-DD form is
+    accepted, not the other ISO 8601 forms date.fromisoformat knows.
+    
+    Args:
+        raw: Date string from the request, may be empty
+        required: Treat an empty value as invalid instead of returning None
+        
+    Returns:
+        date, or None if empty and not required
+        
+    Raises:
+        ValueError: If the date is malformed (or missing when required)
+    """
+    if not raw and not required:
+        return None
+    # Also rejects non-strings (e.g. a number in a JSON body), so only the
+    # parse itself can fail below
+    if not isinstance(raw, str) or len(raw) != 10 or raw[4] != '-' or raw[7] != '-':
+        raise ValueError('Invalid date format. Use YYYY-MM-DD')
+    try:
+        return date.fromisoformat(raw)
+    except ValueError:
+        raise ValueError('Invalid date format. Use YYYY-MM-DD')
+
+
+def _parse_value(raw) -> Optional[Decimal]:
+    """
+    Parse a contract value as an exact Decimal rounded to cents
+    
+    Args:
+        raw: Value from the request (string or number), may be empty
+        
+    Returns:
+        Decimal value, or None if empty
+        
+    Raises:
+        ValueError: If the value is not a finite number
+    """
+    if not raw:
+        return None
+    try:
+        value = Decimal(str(raw)).quantize(_CENTS, rounding=ROUND_HALF_UP)
+    except InvalidOperation:
+        raise ValueError(f'Invalid contract value: {raw}')
+    if not value.is_finite():
+        raise ValueError(f'Invalid contract value: {raw}')
+    return value
+
+
+def _contract_list_item(row) -> Dict:
+    """
+    Map a contract list row (see ContractRepository._details_select) to its response dict
+    
+    Dates and values are left as date/datetime/Decimal objects - the
+    response encoder writes them as ISO 8601 strings and decimal strings.
+    """
+    return {
+        'id': row.contract_instance_id,
+        'contractId': row.id,
+        'contractName': row.contract_name,
+        'clientName': row.client_name,
+        'contractType': row.contract_type_name,
+        'startDate': row.start_date,
+        'endDate': row.end_date,
+        'value': row.value,
+        'status': row.status_name,
+        'description': row.description,
+        'version': row.version,
+        'renewed_from': row.renewed_from,
+        'renewed_to': row.renewed_to,
+        'createdAt': row.created_at,
+        'createdBy': row.creator_email,
+        'lastModified': row.updated_at
+    }
+
 
 class ContractService:
     """Service for contract business logic"""
@@ -25,39 +109,40 @@ class ContractService:
         self.contract_status_repo = ContractStatusRepository()
         self.storage_service = StorageService()
     
-    def get_all_contracts(self) -> List[Dict]:
+    def get_all_contracts(self, limit: Optional[int] = None, after: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
         """
-        Get all contracts with creator info
+        Get all contracts with creator info, optionally one page at a time
         
+        Args:
+            limit: Page size (None returns every contract)
+            after: Cursor - instance ID of the last contract on the previous page
+            
         Returns:
-            List of contract dictionaries
+            (list of contract dictionaries, cursor for the next page or None)
         """
-        contracts = self.contract_repo.find_all_with_details()
+        # Fetch one extra row to know whether another page follows
+        rows = self.contract_repo.find_all_with_details(limit + 1 if limit else None, after)
+        next_cursor = None
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = rows[-1].contract_instance_id
+        
+        # Plain rows (no ORM instances) mapped straight into response dicts
+        return [_contract_list_item(row) for row in rows], next_cursor
+    
+    def iter_all_contracts(self) -> Iterator[Dict]:
+        """
+        Get all contracts with creator info as they're fetched
         
-        contracts_data = []
-        for contract in contracts:
-            creator = self.user_repo.find_by_id(contract.created_by)
-            
-            contracts_data.append({
-                'id': contract.contract_instance_id,
-                'contractId': contract.id,
-                'contractName': contract.contract_name,
-                'clientName': contract.client_name,
-                'contractType': contract.contract_type.name if contract.contract_type else None,
-                'startDate': contract.start_date.isoformat() if contract.start_date else None,
-                'endDate': contract.end_date.isoformat() if contract.end_date else None,
-                'value': str(contract.value) if contract.value else None,
-                'status': contract.status.name if contract.status else None,
-                'description': contract.description,
-                'version': contract.version,
-                'renewed_from': contract.renewed_from,
-                'renewed_to': contract.renewed_to,
-                'createdAt': contract.created_at.isoformat() if contract.created_at else None,
-                'createdBy': creator.email if creator else None,
-                'lastModified': contract.updated_at.isoformat() if contract.updated_at else None
-            })
+        The query runs immediately; rows are then read from the database in
+        batches while the returned iterator is consumed, so only one batch
+        is held in memory at a time.
         
-        return contracts_data
+        Returns:
+            Iterator of contract dictionaries
+        """
+        result = self.contract_repo.iter_all_with_details()
+        return map(_contract_list_item, result)
     
     def get_contract_details(self, instance_id: str) -> Optional[Dict]:
         """
@@ -69,22 +154,20 @@ class ContractService:
         Returns:
             Contract details dict or None if not found
         """
-        contract = self.contract_repo.find_by_instance_id(instance_id)
+        contract = self.contract_repo.find_by_instance_id_with_details(instance_id)
         if not contract:
             return None
         
-        creator = self.user_repo.find_by_id(contract.created_by)
-        documents = self.document_repo.find_by_contract(instance_id)
-        
-        documents_data = []
-        for doc in documents:
-            documents_data.append({
-                'id': doc.id,
-                'contractId': doc.contract_instance_id,
-                'fileName': doc.document_name,
-                'fileSize': doc.file_size,
-                'uploadedAt': doc.uploaded_at.isoformat() if doc.uploaded_at else None
-            })
+        creator = contract.creator
+        
+        # Dates/Decimals are passed through - the orjson encoder formats them
+        documents_data = [{
+            'id': doc.id,
+            'contractId': doc.contract_instance_id,
+            'fileName': doc.document_name,
+            'fileSize': doc.file_size,
+            'uploadedAt': doc.uploaded_at
+        } for doc in contract.documents]
         
         contract_data = {
             'id': contract.contract_instance_id,
@@ -92,17 +175,17 @@ class ContractService:
             'contractName': contract.contract_name,
             'clientName': contract.client_name,
             'contractType': contract.contract_type.name if contract.contract_type else None,
-            'startDate': contract.start_date.isoformat() if contract.start_date else None,
-            'endDate': contract.end_date.isoformat() if contract.end_date else None,
-            'value': str(contract.value) if contract.value else None,
+            'startDate': contract.start_date,
+            'endDate': contract.end_date,
+            'value': contract.value,
             'status': contract.status.name if contract.status else None,
             'description': contract.description,
             'version': contract.version,
             'renewed_from': contract.renewed_from,
             'renewed_to': contract.renewed_to,
-            'createdAt': contract.created_at.isoformat() if contract.created_at else None,
+            'createdAt': contract.created_at,
             'createdBy': creator.email if creator else None,
-            'lastModified': contract.updated_at.isoformat() if contract.updated_at else None
+            'lastModified': contract.updated_at
         }
         
         return {
@@ -141,6 +224,11 @@ class ContractService:
         if not status_id:
             raise ValueError("Draft status not found in database")
         
+        # Parse dates before storing the file so bad input fails early
+        start_date = _parse_date(data['startDate'], required=True)
+        end_date = _parse_date(data.get('endDate'))
+        value = _parse_value(data.get('value'))
+        
         # Handle file upload
         file_info = None
         if file:
@@ -152,7 +240,7 @@ class ContractService:
         contract_instance_id = Contract.generate_instance_id(contract_id, version)
         
         # Create contract
-        contract = self.contract_repo.create_contract({
+        self.contract_repo.create_contract({
             'contract_instance_id': contract_instance_id,
             'id': contract_id,
             'contract_name': data['contractName'],
@@ -160,9 +248,9 @@ class ContractService:
             'contract_type_id': contract_type_id,
             'status_id': status_id,
             'created_by': user_id,
-            'start_date': datetime.strptime(data['startDate'], '%Y-%m-%d').date(),
-            'end_date': datetime.strptime(data['endDate'], '%Y-%m-%d').date() if data.get('endDate') else None,
-            'value': float(data['value']) if data.get('value') else None,
+            'start_date': start_date,
+            'end_date': end_date,
+            'value': value,
             'version': version,
             'description': data.get('description', '')
         })
@@ -170,29 +258,31 @@ class ContractService:
         # Create document if file uploaded
         if file_info:
             self.document_repo.create_document({
-                'contract_instance_id': contract.contract_instance_id,
+                'contract_instance_id': contract_instance_id,
                 'document_name': file_info['filename'],
                 'file_path': file_info['path'],
                 'file_size': file_info['size'],
                 'version': 1,
                 'document_type_id': 1,  # Main contract type
-                'uploaded_by': user_id,
-                'uploaded_at': datetime.utcnow()
+                'uploaded_by': user_id
             })
         
         self.contract_repo.commit()
         
+        # Use the local values from here on - reading attributes of the
+        # committed (expired) contract would reload it from the database
+        
         # Log creation activity
         log_activity(
-            contract_instance_id=contract.contract_instance_id,
+            contract_instance_id=contract_instance_id,
             activity_type='created',
-            message=f"Contract '{contract.contract_name}' created"
+            message=f"Contract '{data['contractName']}' created"
         )
         
         return {
-            'id': contract.contract_instance_id,
-            'contractId': contract.id,
-            'contractName': contract.contract_name,
+            'id': contract_instance_id,
+            'contractId': contract_id,
+            'contractName': data['contractName'],
             'fileName': file_info['filename'] if file_info else None
         }
     
@@ -218,8 +308,8 @@ class ContractService:
         old_values = {
             'contractName': contract.contract_name,
             'clientName': contract.client_name,
-            'contractType': contract.contract_type.name if contract.contract_type else None,
-            'status': contract.status.name if contract.status else None,
+            'contractType': self.contract_type_repo.get_name_by_id(contract.contract_type_id),
+            'status': self.contract_status_repo.get_name_by_id(contract.status_id),
             'startDate': contract.start_date.isoformat() if contract.start_date else None,
             'endDate': contract.end_date.isoformat() if contract.end_date else None,
             'value': str(contract.value) if contract.value else None,
@@ -234,13 +324,13 @@ class ContractService:
             contract.client_name = data['clientName']
         if 'contractType' in data:
             contract_type_id = self.contract_type_repo.get_id_by_name(data['contractType'])
-            if contract_type_id:
+            if contract_type_id and contract_type_id != contract.contract_type_id:
                 contract.contract_type_id = contract_type_id
         
-        # Handle status changes with business rules
-        if 'status' in data:
+        # Handle status changes with business rules (resending the current status is not a change)
+        if 'status' in data and data['status'] != old_values['status']:
             new_status = data['status']
-            current_status = contract.status.name
+            current_status = old_values['status']
             
             # Business Rule: Renewed contracts cannot change status (archived)
             if current_status == 'renewed':
@@ -261,16 +351,14 @@ class ContractService:
                 raise ValueError(f'Invalid status: {new_status}')
         
         if 'startDate' in data:
-            contract.start_date = datetime.strptime(data['startDate'], '%Y-%m-%d').date()
+            contract.start_date = _parse_date(data['startDate'], required=True)
         if 'endDate' in data:
-            contract.end_date = datetime.strptime(data['endDate'], '%Y-%m-%d').date() if data['endDate'] else None
+            contract.end_date = _parse_date(data['endDate'])
         if 'value' in data:
-            contract.value = float(data['value']) if data['value'] else None
+            contract.value = _parse_value(data['value'])
         if 'description' in data:
             contract.description = data.get('description')
         
-        contract.updated_at = datetime.utcnow()
-        
         # 3️⃣ COMPARE & LOG CHANGES
         changes = []
         
@@ -289,7 +377,9 @@ class ContractService:
                 'newValue': contract.client_name or 'empty'
             })
         
-        new_contract_type = contract.contract_type.name if contract.contract_type else None
+        # Names come from the lookup cache - the contract_type/status relationships
+        # still point at the old rows until the session is flushed
+        new_contract_type = self.contract_type_repo.get_name_by_id(contract.contract_type_id)
         if old_values['contractType'] != new_contract_type:
             changes.append({
                 'field': 'contractType',
@@ -297,7 +387,7 @@ class ContractService:
                 'newValue': new_contract_type or 'empty'
             })
         
-        new_status = contract.status.name if contract.status else None
+        new_status = self.contract_status_repo.get_name_by_id(contract.status_id)
         if old_values['status'] != new_status:
             changes.append({
                 'field': 'status',
@@ -336,17 +426,20 @@ class ContractService:
                 'newValue': contract.description or 'empty'
             })
         
+        # Nothing changed - skip the commit and the activity record
+        if not changes:
+            return contract
+        
         # Commit changes
         self.contract_repo.commit()
         
-        # 4️⃣ LOG ACTIVITY (only if something actually changed)
-        if changes:
-            log_activity(
-                contract_instance_id=instance_id,
-                activity_type='modified',
-                message=f'Contract updated - {len(changes)} field(s) changed',
-                changes=changes
-            )
+        # 4️⃣ LOG ACTIVITY
+        log_activity(
+            contract_instance_id=instance_id,
+            activity_type='modified',
+            message=f'Contract updated - {len(changes)} field(s) changed',
+            changes=changes
+        )
         
         return contract
     
@@ -374,15 +467,14 @@ class ContractService:
         file_info = self.storage_service.save_file(file)
         
         # Create document record
-        document = self.document_repo.create_document({
+        document = self.document_repo.insert_document({
             'contract_instance_id': instance_id,
             'document_name': file_info['filename'],
             'file_path': file_info['path'],
             'file_size': file_info['size'],
             'version': 1,
             'document_type_id': 2,  # Supporting document
-            'uploaded_by': user_id,
-            'uploaded_at': datetime.utcnow()
+            'uploaded_by': user_id
         })
         
         self.document_repo.commit()
@@ -396,10 +488,10 @@ class ContractService:
         
         return {
             'id': document.id,
-            'contractId': document.contract_instance_id,
-            'fileName': document.document_name,
-            'fileSize': document.file_size,
-            'uploadedAt': document.uploaded_at.isoformat()
+            'contractId': instance_id,
+            'fileName': file_info['filename'],
+            'fileSize': file_info['size'],
+            'uploadedAt': document.uploaded_at
         }
     
     def renew_contract(self, instance_id: str, data: Dict, file: FileStorage, user_id: int) -> Dict:
@@ -424,8 +516,9 @@ class ContractService:
             raise ValueError('Contract not found')
         
         # Business Rule: Can only renew from 'active' status
-        if old_contract.status.name != 'active':
-            raise ValueError(f'Can only renew active contracts. Current status: {old_contract.status.name}')
+        if old_contract.status_id != self.contract_status_repo.get_id_by_name('active'):
+            current_status = self.contract_status_repo.get_name_by_id(old_contract.status_id)
+            raise ValueError(f'Can only renew active contracts. Current status: {current_status}')
         
         # Business Rule: Cannot renew if already renewed
         if old_contract.renewed_to:
@@ -438,37 +531,43 @@ class ContractService:
         if not new_start_date or not new_end_date:
             raise ValueError('new_start_date and new_end_date are required')
         
-        try:
-            start_date_obj = datetime.strptime(new_start_date, '%Y-%m-%d').date()
-            end_date_obj = datetime.strptime(new_end_date, '%Y-%m-%d').date()
-        except ValueError:
-            raise ValueError('Invalid date format. Use YYYY-MM-DD')
+        start_date_obj = _parse_date(new_start_date, required=True)
+        end_date_obj = _parse_date(new_end_date, required=True)
         
         # Business Rule: End date must be after start date
         if end_date_obj <= start_date_obj:
             raise ValueError('End date must be after start date')
         
         # Business Rule: Start date cannot be in the past
-        if start_date_obj < datetime.now().date():
+        if start_date_obj < date.today():
             raise ValueError('Start date cannot be in the past')
         
-        # Save new file
+        new_value = _parse_value(data.get('new_value'))
+        
         if not file:
             raise ValueError('Contract document is required for renewal')
         
-        file_info = self.storage_service.save_file(file)
-        
-        # Get max version and create new
-        new_version = self.contract_repo.get_max_version(old_contract.id) + 1
-        new_contract_instance_id = Contract.generate_instance_id(old_contract.id, new_version)
-        
-        # Get draft status
+        # Do every read before staging the inserts below, so no query can
+        # autoflush them early and the commit writes everything in one go
         draft_status_id = self.contract_status_repo.get_id_by_name('draft')
         if not draft_status_id:
             raise ValueError('Draft status not found in database')
+        renewed_status_id = self.contract_status_repo.get_id_by_name('renewed')
+        
+        # Only an unrenewed contract gets here, and renewing marks the old
+        # version renewed - so it is the latest version and no MAX() query is
+        # needed. A concurrent renewal collides on the instance ID primary key
+        new_version = old_contract.version + 1
+        new_contract_instance_id = Contract.generate_instance_id(old_contract.id, new_version)
+        
+        # Save new file
+        file_info = self.storage_service.save_file(file)
+        
+        # Core INSERTs/UPDATE - nothing below reads the new rows back, so
+        # there's no need to go through the ORM unit of work
         
         # Create new contract version
-        new_contract = self.contract_repo.create_contract({
+        self.contract_repo.insert_contract({
             'contract_instance_id': new_contract_instance_id,
             'id': old_contract.id,  # Same contract ID to group versions
             'contract_name': old_contract.contract_name,
@@ -478,34 +577,33 @@ class ContractService:
             'created_by': user_id,
             'start_date': start_date_obj,
             'end_date': end_date_obj,
-            'value': float(data['new_value']) if data.get('new_value') else old_contract.value,
+            'value': new_value if new_value is not None else old_contract.value,
             'version': new_version,
             'renewed_from': old_contract.contract_instance_id,
             'description': old_contract.description
         })
         
         # Create document for new version
-        self.document_repo.create_document({
+        self.document_repo.insert_document({
             'contract_instance_id': new_contract_instance_id,
             'document_name': file_info['filename'],
             'file_path': file_info['path'],
             'file_size': file_info['size'],
             'version': 1,
             'document_type_id': 1,
-            'uploaded_by': user_id,
-            'uploaded_at': datetime.utcnow()
+            'uploaded_by': user_id
         })
         
         # Update old contract
-        renewed_status_id = self.contract_status_repo.get_id_by_name('renewed')
+        old_contract_updates = {'renewed_to': new_contract_instance_id}
         if renewed_status_id:
-            old_contract.status_id = renewed_status_id
-        old_contract.renewed_to = new_contract_instance_id
+            old_contract_updates['status_id'] = renewed_status_id
+        self.contract_repo.update_fields(instance_id, old_contract_updates)
         
         self.contract_repo.commit()
         
         return {
-            'old_version': old_contract.contract_instance_id,
-            'new_version': new_contract.contract_instance_id,
-            'new_contract_id': new_contract.contract_instance_id
+            'old_version': instance_id,
+            'new_version': new_contract_instance_id,
+            'new_contract_id': new_contract_instance_id
         }
@@ -0,0 +1,131 @@
+"""Process pool that runs NER extraction outside the web worker
+
+Extraction is CPU-bound (PDF parsing and the spaCy model), so running it on
+a request thread holds the GIL and stalls every other request the worker is
+serving. Pool processes each load the model once and take documents as bytes.
+"""
+
+import io
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional
+
+# Settings from app config (see init_extraction_pool) - the pool itself
+# starts on the first extraction, so workers that never extract don't pay for it
+_max_workers = 1
+_timeout = 60
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+# Extraction service of the current pool process, loaded by _init_worker
+_worker_service = None
+
+
+def init_extraction_pool(app) -> None:
+    """
+    Read the extraction pool settings from app config
+
+    Args:
+        app: Flask application
+    """
+    global _max_workers, _timeout
+    _max_workers = app.config['EXTRACTION_PROCESSES']
+    _timeout = app.config['EXTRACTION_TIMEOUT']
+
+
+def _init_worker() -> None:
+    """Pool process initializer - import spaCy and load the model once"""
+    global _worker_service
+    from app.services.contract_extraction_service import ContractExtractionService
+    _worker_service = ContractExtractionService()
+
+
+def _extract(data: bytes, filename: str) -> Dict:
+    """Pool task, runs in a pool process"""
+    return _worker_service.extract_from_stream(io.BytesIO(data), filename)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Get the pool, starting it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn - forking a threaded web worker can copy held locks
+            _pool = ProcessPoolExecutor(
+                max_workers=_max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker
+            )
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor, terminate: bool = False) -> None:
+    """
+    Drop a pool so the next extraction starts a new one
+    
+    Args:
+        pool: Pool to drop
+        terminate: Kill its processes too - a running task can't be cancelled
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    if terminate:
+        _terminate_workers(pool)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _terminate_workers(pool: ProcessPoolExecutor) -> None:
+    """Kill a pool's processes, failing its pending futures with BrokenProcessPool"""
+    if hasattr(pool, 'terminate_workers'):
+        # Python 3.14+
+        pool.terminate_workers()
+        return
+    # Python 3.11-3.13 have no public API for this. CPython keeps the worker
+    # processes in _processes (a pid -> Process dict, None once shut down) -
+    # if that ever changes, the stuck process is left to finish on its own
+    processes = getattr(pool, '_processes', None)
+    if not isinstance(processes, dict):
+        return
+    for process in list(processes.values()):
+        process.terminate()
+
+
+def extract_document(data: bytes, filename: str) -> Dict:
+    """
+    Run NER extraction on a document in a pool process
+
+    Blocks the calling thread until the result is ready, but without
+    holding the GIL, so the worker's other threads keep serving requests.
+
+    Args:
+        data: Document contents
+        filename: Original file name - its extension picks the reader
+
+    Returns:
+        Extracted fields (see ContractExtractionService.extract_from_pdf)
+
+    Raises:
+        ValueError: If the file type is unsupported
+        TimeoutError: If extraction takes longer than EXTRACTION_TIMEOUT
+    """
+    for attempt in range(2):
+        pool = _get_pool()
+        future = pool.submit(_extract, data, filename)
+        try:
+            return future.result(timeout=_timeout)
+        except TimeoutError:
+            # The task keeps running in its process and everything submitted
+            # after it would queue behind it - kill the pool's processes
+            _discard_pool(pool, terminate=True)
+            raise
+        except BrokenProcessPool:
+            # A pool process died (killed for memory, or terminated after
+            # another request timed out) - retry once on a fresh pool
+            _discard_pool(pool)
+            if attempt:
+                raise
@@ -1,24 +1,40 @@
 """Storage service for file handling operations"""
 
+import logging
 import os
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, Optional
+from flask import current_app
 from werkzeug.utils import secure_filename
 from werkzeug.datastructures import FileStorage
-from flask import current_app
+from app.utils.helpers import ensure_dir
+from app.utils.uploads import UploadTempFile, get_upload_folder
+
+
+# Uploads commonly repeat the same names (e.g. new versions of one contract)
+_secure_filename = lru_cache(maxsize=1024)(secure_filename)
+
+# Child of the app logger, so records go through its queued handlers;
+# usable from the background thread, which has no app context
+logger = logging.getLogger(__name__)
+
+# Background disk work that the response doesn't need to wait for
+_io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='storage-io')
 
 
 class StorageService:
     """Service for handling file storage operations"""
     
-    ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx'}
-    
     def __init__(self):
         """Initialize storage service"""
         pass
     
     def is_allowed_file(self, filename: str) -> bool:
         """
-        Check if file extension is allowed
+        Check if file extension is allowed (ALLOWED_EXTENSIONS in app config)
         
         Args:
             filename: Name of the file
@@ -26,8 +42,8 @@ class StorageService:
         Returns:
             True if allowed, False otherwise
         """
-        return '.' in filename and \
-               filename.rsplit('.', 1)[1].lower() in self.ALLOWED_EXTENSIONS
+        _, dot, ext = filename.rpartition('.')
+        return bool(dot) and ext.lower() in current_app.config['ALLOWED_EXTENSIONS']
     
     def save_file(self, file: FileStorage, subfolder: str = '') -> Dict[str, any]:
         """
@@ -38,7 +54,8 @@ class StorageService:
             subfolder: Optional subfolder path
             
         Returns:
-            Dict with file info (filename, path, size)
+            Dict with file info (filename, path, size) - filename is the
+            secured original name for display, path is unique per upload
             
         Raises:
             ValueError: If file is invalid or extension not allowed
@@ -47,28 +64,35 @@ class StorageService:
             raise ValueError("No file provided")
         
         if not self.is_allowed_file(file.filename):
-            raise ValueError(f"File type not allowed. Allowed types: {', '.join(self.ALLOWED_EXTENSIONS)}")
+            allowed = ', '.join(sorted(current_app.config['ALLOWED_EXTENSIONS']))
+            raise ValueError(f"File type not allowed. Allowed types: {allowed}")
         
         # Secure the filename
-        filename = secure_filename(file.filename)
+        filename = _secure_filename(file.filename)
         
-        # Create upload directory
-        upload_folder = current_app.config['UPLOAD_FOLDER']
+        # Upload folder is absolute and created at startup; subfolders on first use
+        upload_folder = get_upload_folder()
         if subfolder:
             upload_folder = os.path.join(upload_folder, subfolder)
+            ensure_dir(upload_folder)
         
-        # Convert to absolute path
-        upload_folder = os.path.abspath(upload_folder)
-        os.makedirs(upload_folder, exist_ok=True)
-        
-        # Build full file path (absolute)
-        file_path = os.path.join(upload_folder, filename)
+        # Build full file path (absolute) - the random prefix keeps uploads
+        # with the same name from overwriting each other, without a stat() check
+        file_path = os.path.join(upload_folder, f'{uuid.uuid4().hex}_{filename}')
         
-        # Save file
-        file.save(file_path)
-        
-        # Get file size
-        file_size = os.path.getsize(file_path)
+        # Save file - streamed uploads are already on disk, just move them into place
+        if isinstance(file.stream, UploadTempFile):
+            file.stream.commit(file_path)
+            file_size = file.stream.size
+        else:
+            # Size from the in-memory stream rather than a stat() after saving
+            stream = file.stream
+            stream.seek(0, os.SEEK_END)
+            file_size = stream.tell()
+            stream.seek(0)
+            # 'x' - an existing file at this path would be a bug, fail rather than clobber it
+            with open(file_path, 'xb') as dst:
+                shutil.copyfileobj(stream, dst)
         
         return {
             'filename': filename,
@@ -86,17 +110,32 @@ class StorageService:
         Returns:
             True if deleted, False if file not found
         """
-        if not file_path or not os.path.exists(file_path):
+        if not file_path:
             return False
         
+        # One syscall - remove() reports a missing file itself, no exists() check first
         try:
             os.remove(file_path)
             return True
+        except FileNotFoundError:
+            return False
         except Exception as e:
             # Log error but don't crash
-            print(f"Error deleting file {file_path}: {str(e)}")
+            logger.warning('Error deleting file %s: %s', file_path, e)
             return False
     
+    def delete_file_in_background(self, file_path: str):
+        """
+        Delete file from storage on a background thread
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            Future resolving to the delete_file result
+        """
+        return _io_pool.submit(self.delete_file, file_path)
+    
     def file_exists(self, file_path: str) -> bool:
         """
         Check if file exists
@@ -119,6 +158,9 @@ class StorageService:
         Returns:
             File size or None if not found
         """
-        if self.file_exists(file_path):
+        if not file_path:
+            return None
+        try:
             return os.path.getsize(file_path)
-        return None
+        except OSError:
+            return None
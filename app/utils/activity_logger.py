@@ -1,6 +1,7 @@
+from sqlalchemy import insert
 from app.models.activity_history import ActivityHistory
 from app.extensions import db
-from flask_jwt_extended import get_jwt_identity
+from app.utils.auth import get_current_user_id
 
 
 def log_activity(contract_instance_id, activity_type, message, changes=None):
@@ -25,11 +26,10 @@ def log_activity(contract_instance_id, activity_type, message, changes=None):
         )
     """
     try:
-        # Get current user from JWT token
+        # Get current user from JWT token (parsed once per request)
         try:
-            current_user = get_jwt_identity()
-            user_email = current_user.get('email', 'Unknown') if isinstance(current_user, dict) else current_user
-        except:
+            user_email = str(get_current_user_id())
+        except (RuntimeError, TypeError, ValueError):
             user_email = 'System'
         
         # Build details object
@@ -37,15 +37,14 @@ def log_activity(contract_instance_id, activity_type, message, changes=None):
         if changes:
             details['changes'] = changes
         
-        # Create activity record
-        activity = ActivityHistory(
+        # Create activity record - Core INSERT, nothing reads the row back,
+        # so no ORM instance or RETURNING of the generated id/timestamp
+        db.session.execute(insert(ActivityHistory).values(
             contract_instance_id=contract_instance_id,
             type=activity_type,
             user=user_email,
             details=details
-        )
-        
-        db.session.add(activity)
+        ))
         db.session.commit()
         
         return True
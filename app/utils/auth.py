@@ -0,0 +1,19 @@
+"""Authentication helpers for request handlers"""
+
+from flask import g
+from flask_jwt_extended import get_jwt_identity
+
+
+def get_current_user_id() -> int:
+    """
+    Get the authenticated user's ID for the current request
+    
+    The JWT identity is parsed once and memoized on flask.g, so repeat
+    calls within the same request don't go back to the JWT extension.
+    
+    Returns:
+        User ID from the JWT identity
+    """
+    if 'current_user_id' not in g:
+        g.current_user_id = int(get_jwt_identity())
+    return g.current_user_id
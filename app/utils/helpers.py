@@ -0,0 +1,36 @@
+"""Shared request and filesystem helpers"""
+
+import os
+from typing import Optional
+from flask import current_app, request
+
+# Directories already created in this process (create_app may run many times, e.g. in tests)
+_DIRS_READY = set()
+
+
+def get_json_body() -> Optional[dict]:
+    """
+    Parse the request body as a JSON object
+    
+    JSON bodies are capped at MAX_JSON_CONTENT_LENGTH, which is much smaller
+    than the upload limit, so oversize payloads get a 413 before parsing.
+    The parsed body is not cached on the request since handlers read it once.
+    
+    Returns:
+        Parsed dict, or None if the body is missing, malformed or not an object
+    """
+    request.max_content_length = current_app.config['MAX_JSON_CONTENT_LENGTH']
+    data = request.get_json(silent=True, cache=False)
+    return data if isinstance(data, dict) else None
+
+
+def ensure_dir(path: str) -> None:
+    """
+    Create a directory once per process
+    
+    Args:
+        path: Directory path
+    """
+    if path not in _DIRS_READY:
+        os.makedirs(path, exist_ok=True)
+        _DIRS_READY.add(path)
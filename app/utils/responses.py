@@ -0,0 +1,102 @@
+"""JSON response helpers backed by orjson"""
+
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Iterable, Optional, Union
+import orjson
+from flask import Response, stream_with_context
+from flask.json.provider import JSONProvider
+
+
+def _default(obj: Any) -> Any:
+    """Serialize types orjson doesn't handle natively"""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize obj to JSON bytes"""
+    return orjson.dumps(obj, default=_default)
+
+
+def json_response(body: Union[dict, list, bytes], status: int = 200) -> Response:
+    """
+    Build a JSON response without going through jsonify
+
+    Args:
+        body: Object to serialize, or an already serialized JSON body
+        status: HTTP status code
+
+    Returns:
+        Flask Response
+    """
+    if not isinstance(body, bytes):
+        body = dumps(body)
+    return Response(body, status=status, mimetype='application/json')
+
+
+def success_response(data: Any = None, message: Optional[str] = None, status: int = 200, **fields) -> Response:
+    """
+    Build a standard success response
+
+    Example:
+        success_response(result, message='Contract created successfully', status=201)
+        -> {"success": true, "message": "...", "data": {...}}
+    """
+    body = {'success': True}
+    if message is not None:
+        body['message'] = message
+    if data is not None:
+        body['data'] = data
+    body.update(fields)
+    return json_response(body, status)
+
+
+def success_stream_response(items: Iterable[Any], chunk_size: int = 500) -> Response:
+    """
+    Build a standard success response whose data list is streamed
+
+    Items are serialized and sent chunk_size at a time while the response
+    is written, so the full list (and its JSON) is never held in memory.
+    The request context stays available to the iterable until it's done.
+
+    Example:
+        success_stream_response(contract_service.iter_all_contracts())
+        -> {"success":true,"data":[{...},{...}]}
+    """
+    def generate():
+        iterator = iter(items)
+        yield b'{"success":true,"data":['
+        separator = b''
+        while chunk := list(islice(iterator, chunk_size)):
+            yield separator + b','.join(map(dumps, chunk))
+            separator = b','
+        yield b']}'
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+
+def error_response(message: str, status: int) -> Response:
+    """
+    Build a standard error response
+
+    Example:
+        error_response('Contract not found', 404)
+        -> {"success": false, "error": "Contract not found"}
+    """
+    return json_response({'success': False, 'error': message}, status)
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider using orjson, so jsonify and request.get_json use it too"""
+
+    def dumps(self, obj: Any, **kwargs) -> str:
+        return dumps(obj).decode()
+
+    def loads(self, s: Union[str, bytes], **kwargs) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return json_response(dumps(obj))
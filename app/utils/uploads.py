@@ -0,0 +1,96 @@
+"""Upload streaming - multipart file parts are written straight into the upload folder"""
+
+import os
+import tempfile
+from flask import Request
+from app.utils.helpers import ensure_dir
+
+# Absolute upload folder - config doesn't change at runtime, so it's resolved once
+_upload_folder = None
+
+# Mode for stored files - what a regular open() would create under the process umask
+# (read once here: os.umask can only be read by setting it, which isn't thread-safe)
+_umask = os.umask(0)
+os.umask(_umask)
+_file_mode = 0o666 & ~_umask
+
+
+def init_upload_folder(app) -> None:
+    """
+    Resolve and create the upload folder from app config
+    
+    Args:
+        app: Flask application
+    """
+    global _upload_folder
+    _upload_folder = os.path.abspath(app.config['UPLOAD_FOLDER'])
+    ensure_dir(_upload_folder)
+
+
+def get_upload_folder() -> str:
+    """Absolute path of the upload folder"""
+    return _upload_folder
+
+
+class UploadTempFile:
+    """
+    Temporary file in the upload folder holding one uploaded file part
+
+    Werkzeug writes the part into it while parsing the request body. Saving
+    the upload is then a rename into place instead of copying the bytes
+    from a spooled temp file a second time. If the upload is never saved,
+    the file is removed when the request closes.
+    """
+
+    def __init__(self, directory: str):
+        fd, self.name = tempfile.mkstemp(prefix='.upload_', dir=directory)
+        # mkstemp creates 0600 and the rename keeps it - stored documents
+        # should get the usual permissions
+        os.fchmod(fd, _file_mode)
+        self._file = os.fdopen(fd, 'w+b')
+        self.size = 0  # bytes written so far - no stat() needed afterwards
+        self.committed = False
+
+    def __getattr__(self, attr):
+        # read/readline/seek/tell/flush/fileno - whatever FileStorage needs
+        return getattr(self._file, attr)
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        return self._file.write(data)
+
+    def commit(self, file_path: str) -> None:
+        """
+        Move the uploaded bytes to their final path
+
+        Args:
+            file_path: Destination path (same filesystem as the upload folder)
+        """
+        self._file.close()
+        os.replace(self.name, file_path)
+        self.committed = True
+
+    def close(self) -> None:
+        """Close and discard the temp file unless it was committed"""
+        self._file.close()
+        if not self.committed:
+            try:
+                os.remove(self.name)
+            except FileNotFoundError:
+                pass
+            self.committed = True
+
+
+class UploadRequest(Request):
+    """Request class that streams uploaded files into the upload folder"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        stream = UploadTempFile(_upload_folder)
+        # Tracked here too so a part that fails mid-parse still gets cleaned up
+        self.__dict__.setdefault('_upload_streams', []).append(stream)
+        return stream
+
+    def close(self) -> None:
+        super().close()
+        for stream in self.__dict__.get('_upload_streams', ()):
+            stream.close()
@@ -0,0 +1,33 @@
+"""Composite indexes for contract versions and activity history
+
+Revision ID: 4e7d2c91b5a3
+Revises: adcb52125bb5
+Create Date: 2026-10-15 23:02:41.507316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4e7d2c91b5a3'
+down_revision = 'adcb52125bb5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Built without locking out writes (CONCURRENTLY can't run inside a transaction)
+    with op.get_context().autocommit_block():
+        op.create_index('ix_contracts_id_version', 'contracts', ['id', 'version'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_activity_history_instance_timestamp', 'activity_history', ['contract_instance_id', 'timestamp'], unique=False, postgresql_concurrently=True)
+    # Leading columns of the new indexes - the single-column ones are redundant
+    op.drop_index(op.f('ix_contracts_id'), table_name='contracts')
+    op.drop_index(op.f('ix_activity_history_contract_instance_id'), table_name='activity_history')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_activity_history_contract_instance_id'), 'activity_history', ['contract_instance_id'], unique=False)
+    op.create_index(op.f('ix_contracts_id'), 'contracts', ['id'], unique=False)
+    op.drop_index('ix_activity_history_instance_timestamp', table_name='activity_history')
+    op.drop_index('ix_contracts_id_version', table_name='contracts')
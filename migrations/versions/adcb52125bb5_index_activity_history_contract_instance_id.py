@@ -0,0 +1,24 @@
+"""Index activity_history.contract_instance_id
+
+Revision ID: adcb52125bb5
+Revises: 35df130d2b97
+Create Date: 2026-10-15 22:45:12.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'adcb52125bb5'
+down_revision = '35df130d2b97'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_activity_history_contract_instance_id'), 'activity_history', ['contract_instance_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_activity_history_contract_instance_id'), table_name='activity_history')